@@ -20,8 +20,14 @@ class AesMode(enum.Enum):
 
 
 class AesCipher(object):
-    def __init__(self, key: bytes, mode: AesMode = AesMode.ECB) -> None:
-        iv = os.urandom(16)
+    def __init__(
+            self,
+            key: bytes,
+            mode: AesMode = AesMode.ECB,
+            iv: bytes|None = None
+    ) -> None:
+        if iv is None:
+            iv = os.urandom(16)
 
         self.mode = {
             AesMode.ECB: modes.ECB(),
@@ -0,0 +1,88 @@
+"""dh.py
+
+Implementation of finite field Diffie-Hellman key exchange. Public keys are
+computed with a precomputed table for the generator, which is shared between
+every key pair using the same group.
+"""
+
+
+import functools
+import hashlib
+import secrets
+
+from algorithms.numbertheory import FixedBaseExp, int_to_bytes
+
+
+NIST_PRIME = int(
+    "ffffffffffffffffc90fdaa22168c234c4c6628b80dc1cd129024"
+    "e088a67cc74020bbea63b139b22514a08798e3404ddef9519b3cd"
+    "3a431b302b0a6df25f14374fe1356d6d51c245e485b576625e7ec"
+    "6f44c42e9a637ed6b0bff5cb6f406b7edee386bfb5a899fa5ae9f"
+    "24117c4b1fe649286651ece45b3dc2007cb8a163bf0598da48361"
+    "c55d39a69163fa8fd24cf5f83655d23dca3ad961c62f356208552"
+    "bb9ed529077096966d670c354e4abc9804f1746c08ca237327fff"
+    "fffffffffffff",
+    16
+)
+NIST_GENERATOR = 2
+
+
+@functools.lru_cache(maxsize=16)
+def fixed_base(g: int, p: int) -> FixedBaseExp:
+    """Get the shared precomputed exponentiation table for a group.
+
+    Parameters:
+        g           Generator
+        p           Prime modulus
+
+    Returns:
+        Returns the FixedBaseExp for the generator.
+    """
+    return FixedBaseExp(g, p)
+
+
+class DiffieHellman(object):
+    """One party's Diffie-Hellman key pair."""
+    def __init__(
+            self,
+            p: int = NIST_PRIME,
+            g: int = NIST_GENERATOR,
+            private: int|None = None
+    ) -> None:
+        self.p = p
+        self.g = g
+        self.private = secrets.randbelow(p - 2) + 1 if private is None else private
+        self.public = fixed_base(g, p)(self.private)
+
+    def __repr__(self) -> str:
+        return f"DiffieHellman(p={self.p.bit_length()} bits, g={self.g})"
+
+    def shared_secret(self, public: int) -> int:
+        """Calculate the secret shared with another party. The other
+        public key is not validated, so attacks which send degenerate
+        values such as 0, 1 or p can be reproduced.
+
+        Parameters:
+            public      Other party's public key
+
+        Returns:
+            Returns the shared secret.
+        """
+        return pow(public, self.private, self.p)
+
+    def session_key(self, public: int, length: int = 16) -> bytes:
+        """Derive a symmetric key from the shared secret by hashing it
+        with SHA-1.
+
+        Parameters:
+            public      Other party's public key
+            length      Key length in bytes, at most 20
+
+        Returns:
+            Returns the derived key.
+        """
+        if not 0 < length <= 20:
+            raise ValueError(f"Invalid session key length ({length})")
+
+        secret = int_to_bytes(self.shared_secret(public))
+        return hashlib.sha1(secret).digest()[:length]
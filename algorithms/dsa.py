@@ -0,0 +1,132 @@
+"""dsa.py
+
+Implementation of the Digital Signature Algorithm (DSA) as defined by NIST in
+FIPS 186, using SHA-1 as the message hash.
+"""
+
+
+import hashlib
+import secrets
+
+from algorithms.numbertheory import bytes_to_int, invmod
+
+
+DSA_P = int(
+    "800000000000000089e1855218a0e7dac38136ffafa72eda7"
+    "859f2171e25e65eac698c1702578b07dc2a1076da241c76c6"
+    "2d374d8389ea5aeffd3226a0530cc565f3bf6b50929139ebe"
+    "ac04f48c3c84afb796d61e5a4f9a8fda812ab59494232c7d2"
+    "b4deb50aa18ee9e132bfa85ac4374d7f9091abc3d015efc87"
+    "1a584471bb1",
+    16
+)
+DSA_Q = int("f4f47f05794b256174bba6e9b396a7707e563c5b", 16)
+DSA_G = int(
+    "5958c9d3898b224b12672c0b98e06c60df923cb8bc999d119"
+    "458fef538b8fa4046c8db53039db620c094c9fa077ef389b5"
+    "322a559946a71903f990f1f7e0e025e2d7f7cf494aff1a047"
+    "0f5b64c36b625a097f1651fe775323556fe00b3608c887892"
+    "878480e99041be601a62166ca6894bdd41a7054ec89f756ba"
+    "9fc95302291",
+    16
+)
+
+
+def message_hash(message: bytes) -> int:
+    """Hash a message for signing.
+
+    Parameters:
+        message     Message to hash
+
+    Returns:
+        Returns the SHA-1 digest as an integer.
+    """
+    return bytes_to_int(hashlib.sha1(message).digest())
+
+
+class DsaKey(object):
+    """DSA key. Public keys only hold the group parameters and y."""
+    def __init__(
+            self,
+            y: int,
+            x: int|None = None,
+            p: int = DSA_P,
+            q: int = DSA_Q,
+            g: int = DSA_G
+    ) -> None:
+        self.y = y
+        self.x = x
+        self.p = p
+        self.q = q
+        self.g = g
+
+    @classmethod
+    def generate(cls, p: int = DSA_P, q: int = DSA_Q, g: int = DSA_G) -> "DsaKey":
+        """Generate a new private key.
+
+        Parameters:
+            p           Prime modulus
+            q           Prime order of the generator
+            g           Generator
+
+        Returns:
+            Returns the new key.
+        """
+        x = secrets.randbelow(q - 1) + 1
+        return cls(pow(g, x, p), x, p, q, g)
+
+    def __repr__(self) -> str:
+        kind = "public" if self.x is None else "private"
+        return f"DsaKey(p={self.p.bit_length()} bits, q={self.q.bit_length()} bits, {kind})"
+
+    def public_key(self) -> "DsaKey":
+        """Get the public part of the key.
+
+        Returns:
+            Returns a key without the private value.
+        """
+        return DsaKey(self.y, None, self.p, self.q, self.g)
+
+    def sign(self, message: bytes, k: int|None = None) -> tuple[int, int]:
+        """Sign a message.
+
+        Parameters:
+            message     Message to sign
+            k           Nonce, random if not given; reusing or leaking it
+                        reveals the private key
+
+        Returns:
+            Returns the signature (r, s).
+        """
+        if self.x is None:
+            raise ValueError("Signing requires a private key")
+
+        h = message_hash(message)
+        while True:
+            nonce = secrets.randbelow(self.q - 1) + 1 if k is None else k
+            r = pow(self.g, nonce, self.p) % self.q
+            s = invmod(nonce, self.q) * (h + self.x * r) % self.q
+            if r != 0 and s != 0:
+                return (r, s)
+            if k is not None:
+                raise ValueError("Nonce gives an invalid signature")
+
+    def verify(self, message: bytes, signature: tuple[int, int]) -> bool:
+        """Verify a message signature.
+
+        Parameters:
+            message     Signed message
+            signature   Signature (r, s)
+
+        Returns:
+            Returns True if the signature is valid.
+        """
+        r, s = signature
+        if not (0 < r < self.q and 0 < s < self.q):
+            return False
+
+        w = invmod(s, self.q)
+        u1 = message_hash(message) * w % self.q
+        u2 = r * w % self.q
+        v = pow(self.g, u1, self.p) * pow(self.y, u2, self.p) % self.p % self.q
+        return v == r
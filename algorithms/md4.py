@@ -0,0 +1,74 @@
+"""md4.py
+
+Implementation of the MD4 message digest algorithm as defined in RFC 1320.
+"""
+
+
+import struct
+
+from algorithms.mdhash import MerkleDamgardHash
+
+
+BLOCK = struct.Struct("<16L")
+
+# Message word order for rounds 2 and 3.
+ORDER_ROUND2 = (0, 4, 8, 12, 1, 5, 9, 13, 2, 6, 10, 14, 3, 7, 11, 15)
+ORDER_ROUND3 = (0, 8, 4, 12, 2, 10, 6, 14, 1, 9, 5, 13, 3, 11, 7, 15)
+
+
+class Md4(MerkleDamgardHash):
+    name = "MD4"
+    digest_size = 16
+    block_size = 64
+    byteorder = "little"
+    initial_state = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476)
+
+    @classmethod
+    def _compress_blocks(cls, state: tuple[int, ...], data: bytes) -> tuple[int, ...]:
+        """Run the MD4 compression function over every block of data.
+
+        Parameters:
+            state       Hash state before the first block
+            data        Data to compress, a multiple of 64 bytes long
+
+        Returns:
+            Returns the hash state after the last block.
+        """
+        h0, h1, h2, h3 = state
+
+        for x in BLOCK.iter_unpack(data):
+            a, b, c, d = h0, h1, h2, h3
+
+            # Each round updates a, d, c, b in turn with its own shift amount,
+            # so rotating the variables after every step covers all four.
+            for i in range(16):
+                t = (a + ((b & c) | (~b & d)) + x[i]) & 0xFFFFFFFF
+                s = (3, 7, 11, 19)[i % 4]
+                a, b, c, d = d, ((t << s) | (t >> (32 - s))) & 0xFFFFFFFF, b, c
+            for i, k in enumerate(ORDER_ROUND2):
+                t = (a + ((b & c) | (b & d) | (c & d)) + x[k] + 0x5A827999) & 0xFFFFFFFF
+                s = (3, 5, 9, 13)[i % 4]
+                a, b, c, d = d, ((t << s) | (t >> (32 - s))) & 0xFFFFFFFF, b, c
+            for i, k in enumerate(ORDER_ROUND3):
+                t = (a + (b ^ c ^ d) + x[k] + 0x6ED9EBA1) & 0xFFFFFFFF
+                s = (3, 9, 11, 15)[i % 4]
+                a, b, c, d = d, ((t << s) | (t >> (32 - s))) & 0xFFFFFFFF, b, c
+
+            h0 = (h0 + a) & 0xFFFFFFFF
+            h1 = (h1 + b) & 0xFFFFFFFF
+            h2 = (h2 + c) & 0xFFFFFFFF
+            h3 = (h3 + d) & 0xFFFFFFFF
+
+        return (h0, h1, h2, h3)
+
+
+def md4(data: bytes = b"") -> Md4:
+    """Create an MD4 hash object, in the style of hashlib.new("md4").
+
+    Parameters:
+        data        Initial data to hash
+
+    Returns:
+        Returns the new hash object.
+    """
+    return Md4(data)
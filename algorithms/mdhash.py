@@ -0,0 +1,202 @@
+"""mdhash.py
+
+Base class for hash functions built with the Merkle-Damgard construction,
+such as MD4 and SHA-1. Unlike hashlib, the internal state (midstate) of these
+hashes can be exported and imported, which is what length extension attacks
+need.
+"""
+
+
+import abc
+import functools
+
+from collections.abc import Iterable, Iterator
+
+
+@functools.lru_cache(maxsize=1024)
+def _padding(length: int, blocksize: int, byteorder: str) -> bytes:
+    """Calculate the Merkle-Damgard padding for a message.
+
+    Parameters:
+        length      Message length in bytes
+        blocksize   Hash block size in bytes
+        byteorder   Byte order of the encoded message length
+
+    Returns:
+        Returns the padding bytes.
+    """
+    zeros = (blocksize - 9 - length) % blocksize
+    return b"\x80" + b"\x00" * zeros + (8 * length).to_bytes(8, byteorder)
+
+
+class MerkleDamgardHash(abc.ABC):
+    """Base class for Merkle-Damgard hashes. Subclasses provide the
+    initial state, byte order and compression function.
+    """
+    name = ""
+    digest_size = 0
+    block_size = 64
+    byteorder = "big"
+    initial_state: tuple[int, ...] = ()
+
+    def __init__(
+            self,
+            data: bytes = b"",
+            state: tuple[int, ...]|None = None,
+            length: int = 0
+    ) -> None:
+        if state is not None and length % self.block_size != 0:
+            raise ValueError(f"Midstate length must be a multiple of {self.block_size}")
+
+        self._state = tuple(self.initial_state if state is None else state)
+        self._length = length
+        self._buffer = b""
+        self.update(data)
+
+    @classmethod
+    @abc.abstractmethod
+    def _compress_blocks(cls, state: tuple[int, ...], data: bytes) -> tuple[int, ...]:
+        """Run the compression function over every block of data.
+
+        Parameters:
+            state       Hash state before the first block
+            data        Data to compress, a multiple of block_size long
+
+        Returns:
+            Returns the hash state after the last block.
+        """
+
+    @classmethod
+    def padding(cls, length: int) -> bytes:
+        """Calculate the padding which is appended to a message before
+        the final compression.
+
+        Parameters:
+            length      Message length in bytes
+
+        Returns:
+            Returns the padding bytes.
+        """
+        return _padding(length, cls.block_size, cls.byteorder)
+
+    @classmethod
+    def from_digest(cls, digest: bytes, length: int) -> "MerkleDamgardHash":
+        """Create a hash whose state is taken from a digest. This is the
+        state the hash was in after the padded message was processed,
+        so more data can be added on top of it.
+
+        Parameters:
+            digest      Digest of a message
+            length      Length of the message, including padding
+
+        Returns:
+            Returns the new hash object.
+        """
+        return cls(state=cls._digest_state(digest), length=length)
+
+    @classmethod
+    def _digest_state(cls, digest: bytes) -> tuple[int, ...]:
+        """Split a digest back into the state words it was made from.
+
+        Parameters:
+            digest      Digest to split
+
+        Returns:
+            Returns the state words.
+        """
+        if len(digest) != cls.digest_size:
+            raise ValueError(f"{cls.name} digest must be {cls.digest_size} bytes, not {len(digest)}")
+
+        words = len(cls.initial_state)
+        size = cls.digest_size // words
+        return tuple(int.from_bytes(digest[i*size:(i+1)*size], cls.byteorder) for i in range(words))
+
+    def copy(self) -> "MerkleDamgardHash":
+        """Copy the hash, including any data waiting to be compressed.
+
+        Returns:
+            Returns the copied hash object.
+        """
+        duplicate = type(self)(state=self._state, length=self._length)
+        duplicate._buffer = self._buffer
+        return duplicate
+
+    def midstate(self) -> tuple[tuple[int, ...], int]:
+        """Export the internal hash state. Data that hasn't filled a
+        whole block yet is not part of the midstate.
+
+        Returns:
+            Returns the state words and the number of bytes compressed.
+        """
+        return (self._state, self._length)
+
+    def update(self, data: bytes) -> None:
+        """Add data to the hash. Whole blocks are compressed at once.
+
+        Parameters:
+            data        Data to add
+        """
+        data = self._buffer + data
+        whole = len(data) - len(data) % self.block_size
+
+        if whole:
+            self._state = self._compress_blocks(self._state, data[:whole])
+            self._length += whole
+        self._buffer = data[whole:]
+
+    def digest(self) -> bytes:
+        """Calculate the digest of all data added so far.
+
+        Returns:
+            Returns the digest as bytes.
+        """
+        length = self._length + len(self._buffer)
+        state = self._compress_blocks(self._state, self._buffer + self.padding(length))
+
+        size = self.digest_size // len(state)
+        return b"".join(word.to_bytes(size, self.byteorder) for word in state)
+
+    def hexdigest(self) -> str:
+        """Calculate the digest of all data added so far.
+
+        Returns:
+            Returns the digest as a lowercase hex string.
+        """
+        return self.digest().hex()
+
+    @classmethod
+    def length_extensions(
+            cls,
+            digest: bytes,
+            message: bytes,
+            extension: bytes,
+            keylengths: Iterable[int]
+    ) -> Iterator[tuple[int, bytes, bytes]]:
+        """Forge secret-prefix MACs, H(key || message), for a message with
+        extra data appended, trying every possible key length.
+
+        The forged message always puts the extension at the start of a
+        block, so whole blocks of the extension are compressed once and
+        shared between all key lengths. Only the final block, which
+        holds the total length, is compressed for each key length.
+
+        Parameters:
+            digest      Known MAC of the message
+            message     Message the MAC was calculated for
+            extension   Data to append to the message
+            keylengths  Possible key lengths
+
+        Returns:
+            Yields (key length, forged message, forged MAC) tuples.
+        """
+        whole = len(extension) - len(extension) % cls.block_size
+        state = cls._compress_blocks(cls._digest_state(digest), extension[:whole])
+        tail = extension[whole:]
+
+        for keylength in keylengths:
+            glue = cls.padding(keylength + len(message))
+            length = keylength + len(message) + len(glue) + whole
+
+            forged = cls(state=state, length=length)
+            forged.update(tail)
+            yield (keylength, message + glue + extension, forged.digest())
@@ -0,0 +1,319 @@
+"""mt19937.py
+
+Implementation of the 32-bit Mersenne Twister (MT19937) pseudorandom number
+generator as defined by Matsumoto and Nishimura, along with a stream cipher
+built on top of it and tools for cloning and seed recovery.
+"""
+
+
+import array
+import functools
+import struct
+import time
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from parallel import bounded_map
+
+
+# MT19937 coefficients.
+N = 624
+M = 397
+A = 0x9908B0DF
+U, D = 11, 0xFFFFFFFF
+S, B = 7, 0x9D2C5680
+T, C = 15, 0xEFC60000
+L = 18
+F = 1812433253
+
+MASK = 0xFFFFFFFF
+UPPER_MASK = 0x80000000
+LOWER_MASK = 0x7FFFFFFF
+MAGNITUDE = (0, A)
+
+
+def _seed_state(seed: int, count: int = N) -> list[int]:
+    """Calculate the first few words of the initial generator state.
+
+    Parameters:
+        seed        Generator seed
+        count       Number of state words to calculate
+
+    Returns:
+        Returns the initial state words.
+    """
+    state = [seed & MASK]
+    for i in range(1, count):
+        prev = state[-1]
+        state.append((F * (prev ^ (prev >> 30)) + i) & MASK)
+    return state
+
+
+def temper(y: int) -> int:
+    """Apply the MT19937 tempering transform to a state word.
+
+    Parameters:
+        y           State word
+
+    Returns:
+        Returns the tempered output.
+    """
+    y ^= (y >> U) & D
+    y ^= (y << S) & B
+    y ^= (y << T) & C
+    y ^= y >> L
+    return y & MASK
+
+
+def untemper(y: int) -> int:
+    """Invert the MT19937 tempering transform, recovering the state word
+    which produced an output.
+
+    Parameters:
+        y           Tempered output
+
+    Returns:
+        Returns the state word.
+    """
+    y ^= y >> L
+
+    y ^= (y << T) & C
+
+    # Each step of these shifts recovers another S (or U) correct bits.
+    result = y
+    for _ in range(32 // S):
+        result = y ^ ((result << S) & B)
+    y = result & MASK
+
+    result = y
+    for _ in range(32 // U):
+        result = y ^ (result >> U)
+    return result & MASK
+
+
+class MT19937(object):
+    def __init__(self, seed: int = 5489) -> None:
+        self._state = array.array("L", _seed_state(seed))
+        self._outputs = array.array("L")
+        self._index = N
+
+    @classmethod
+    def from_state(cls, state: Sequence[int]) -> "MT19937":
+        """Create a generator from a raw state. The next output will be
+        produced by twisting the state.
+
+        Parameters:
+            state       624 state words
+
+        Returns:
+            Returns the new generator.
+        """
+        if len(state) != N:
+            raise ValueError(f"MT19937 state must be {N} words, not {len(state)}")
+
+        generator = cls.__new__(cls)
+        generator._state = array.array("L", [s & MASK for s in state])
+        generator._outputs = array.array("L")
+        generator._index = N
+        return generator
+
+    @classmethod
+    def clone(cls, outputs: Sequence[int]) -> "MT19937":
+        """Clone a generator from 624 of its consecutive outputs. The
+        clone continues where the outputs left off.
+
+        Parameters:
+            outputs     624 consecutive generator outputs
+
+        Returns:
+            Returns the cloned generator.
+        """
+        if len(outputs) != N:
+            raise ValueError(f"Cloning MT19937 requires {N} outputs, not {len(outputs)}")
+
+        return cls.from_state([untemper(y) for y in outputs])
+
+    def _twist(self) -> None:
+        """Generate the next 624 state words and their outputs at once.
+        Word i depends on words i+1 and i+397, which have only been
+        replaced if they wrapped around, so the words can be calculated
+        in runs of 227 without any loop-carried dependency.
+        """
+        mt = self._state
+        for start in range(0, N - 1, N - M):
+            stop = min(start + N - M, N - 1)
+            far = (start + M) % N
+            mt[start:stop] = array.array("L", [
+                z ^ (((x & UPPER_MASK) | (y & LOWER_MASK)) >> 1) ^ MAGNITUDE[y & 1]
+                for x, y, z in zip(
+                    mt[start:stop],
+                    mt[start+1:stop+1],
+                    mt[far:far+stop-start]
+                )
+            ])
+
+        y = (mt[N-1] & UPPER_MASK) | (mt[0] & LOWER_MASK)
+        mt[N-1] = mt[M-1] ^ (y >> 1) ^ MAGNITUDE[y & 1]
+
+        outputs = [y ^ (y >> U) for y in mt]
+        outputs = [y ^ ((y << S) & B) for y in outputs]
+        outputs = [y ^ ((y << T) & C) for y in outputs]
+        self._outputs = array.array("L", [y ^ (y >> L) for y in outputs])
+        self._index = 0
+
+    def extract_number(self) -> int:
+        """Generate the next 32-bit output.
+
+        Returns:
+            Returns the next output.
+        """
+        if self._index >= N:
+            self._twist()
+
+        y = self._outputs[self._index]
+        self._index += 1
+        return y
+
+    def generate(self, count: int) -> list[int]:
+        """Generate a number of 32-bit outputs.
+
+        Parameters:
+            count       Number of outputs to generate
+
+        Returns:
+            Returns the outputs.
+        """
+        outputs = []
+        while len(outputs) < count:
+            if self._index >= N:
+                self._twist()
+
+            take = min(count - len(outputs), N - self._index)
+            outputs.extend(self._outputs[self._index:self._index+take])
+            self._index += take
+
+        return outputs
+
+    def keystream(self, length: int) -> bytes:
+        """Generate a number of random bytes. Each output produces four
+        bytes in little-endian order.
+
+        Parameters:
+            length      Number of bytes to generate
+
+        Returns:
+            Returns the random bytes.
+        """
+        count = (length + 3) // 4
+        return struct.pack(f"<{count}L", *self.generate(count))[:length]
+
+
+class MT19937Cipher(object):
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+
+    def decrypt(self, ciphertext: bytes) -> bytes:
+        """MT19937 stream cipher decryption method.
+
+        Parameters:
+            ciphertext  Encrypted bytes to decrypt
+
+        Returns:
+            Returns the decrypted data as bytes.
+        """
+        return self.encrypt(ciphertext)
+
+    def encrypt(self, plaintext: bytes) -> bytes:
+        """MT19937 stream cipher encryption method. The plaintext is
+        XORed with the keystream of a generator seeded with the key.
+
+        Parameters:
+            plaintext   Data to encrypt
+
+        Returns:
+            Returns the encrypted data as bytes.
+        """
+        keystream = MT19937(self.seed).keystream(len(plaintext))
+        encrypted = int.from_bytes(plaintext, "big") ^ int.from_bytes(keystream, "big")
+        return encrypted.to_bytes(len(plaintext), "big")
+
+
+def _search_seeds(seeds: range, outputs: Sequence[int], offset: int) -> int|None:
+    """Search a range of seeds for one which produces the given outputs.
+    When the first output comes from the first 227 words of the first
+    twist, only the state words it depends on are calculated for each
+    seed, which skips most of the work.
+
+    Parameters:
+        seeds       Seeds to try
+        outputs     Consecutive generator outputs
+        offset      Number of outputs generated before the given ones
+
+    Returns:
+        Returns the first matching seed, or None if none was found.
+    """
+    outputs = list(outputs)
+    first = outputs[0]
+
+    for seed in seeds:
+        if offset < N - M:
+            mt = _seed_state(seed, offset + M + 1)
+            y = (mt[offset] & UPPER_MASK) | (mt[offset+1] & LOWER_MASK)
+            if temper(mt[offset+M] ^ (y >> 1) ^ MAGNITUDE[y & 1]) != first:
+                continue
+
+        generator = MT19937(seed)
+        generator.generate(offset)
+        if generator.generate(len(outputs)) == outputs:
+            return seed
+
+    return None
+
+
+def recover_seed(
+        outputs: Sequence[int],
+        seeds: range,
+        offset: int = 0,
+        jobs: int = 1,
+        chunksize: int = 4096
+) -> tuple[int|None, float]:
+    """Brute-force the seed of a generator from some of its outputs. The
+    search stops as soon as a matching seed is found. Useful when seeds
+    come from a small space, such as recent timestamps or 16-bit keys.
+
+    Parameters:
+        outputs     Consecutive generator outputs
+        seeds       Range of seeds to try
+        offset      Number of outputs generated before the given ones
+        jobs        Number of processes used to search
+        chunksize   Number of seeds searched by each task
+
+    Returns:
+        Returns the matching seed (None if no seed matched) along with
+        the number of seeds tried per second.
+    """
+    if len(outputs) == 0:
+        raise ValueError("At least one output is required to recover a seed")
+
+    chunks = (seeds[i:i+chunksize] for i in range(0, len(seeds), chunksize))
+    started = time.perf_counter()
+    searched = 0
+    found = None
+
+    if jobs > 1:
+        search = functools.partial(_search_seeds, outputs=outputs, offset=offset)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for chunk, found in bounded_map(executor, search, chunks, jobs):
+                searched += len(chunk)
+                if found is not None:
+                    break
+    else:
+        for chunk in chunks:
+            found = _search_seeds(chunk, outputs, offset)
+            searched += len(chunk) if found is None else chunk.index(found) + 1
+            if found is not None:
+                break
+
+    elapsed = time.perf_counter() - started
+    return (found, searched / elapsed if elapsed > 0 else 0.0)
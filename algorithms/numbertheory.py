@@ -0,0 +1,390 @@
+"""numbertheory.py
+
+Number theory building blocks for public key cryptography: modular inverses,
+integer roots, the Chinese remainder theorem, primality testing, fixed-base
+exponentiation with precomputed tables and batch GCD.
+"""
+
+
+import math
+import secrets
+
+from collections.abc import Sequence
+
+
+SMALL_PRIMES = tuple(
+    n for n in range(2, 1000)
+    if all(n % d != 0 for d in range(2, math.isqrt(n) + 1))
+)
+
+# Testing against these bases is enough to prove primality for n < 3.3e24.
+DETERMINISTIC_BASES = SMALL_PRIMES[:13]
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+
+def int_to_bytes(x: int, length: int|None = None) -> bytes:
+    """Convert a non-negative integer to big-endian bytes.
+
+    Parameters:
+        x           Integer to convert
+        length      Number of bytes (the fewest needed if not given)
+
+    Returns:
+        Returns the encoded integer.
+    """
+    if length is None:
+        length = max(1, (x.bit_length() + 7) // 8)
+    return x.to_bytes(length, "big")
+
+
+def bytes_to_int(data: bytes) -> int:
+    """Convert big-endian bytes to a non-negative integer.
+
+    Parameters:
+        data        Bytes to convert
+
+    Returns:
+        Returns the decoded integer.
+    """
+    return int.from_bytes(data, "big")
+
+
+def egcd(a: int, b: int) -> tuple[int, int, int]:
+    """Extended Euclidean algorithm.
+
+    Parameters:
+        a           First integer
+        b           Second integer
+
+    Returns:
+        Returns (g, x, y) such that a*x + b*y = g = gcd(a, b).
+    """
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return (a, x0, y0)
+
+
+def invmod(a: int, m: int) -> int:
+    """Calculate the modular inverse of a.
+
+    Parameters:
+        a           Integer to invert
+        m           Modulus
+
+    Returns:
+        Returns x such that a*x = 1 (mod m).
+    """
+    g, x, _ = egcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"{a} has no inverse modulo {m}")
+    return x % m
+
+
+def iroot(x: int, k: int) -> tuple[int, bool]:
+    """Calculate the integer k-th root of x using Newton's method. Starts
+    from a power of two just above the root, which is found from the bit
+    length, so it converges in a few iterations even for huge x.
+
+    Parameters:
+        x           Integer to take the root of
+        k           Root degree
+
+    Returns:
+        Returns the largest r with r**k <= x (towards zero for negative x)
+        and whether the root is exact.
+    """
+    if k < 1:
+        raise ValueError(f"Invalid root degree ({k})")
+    if x < 0:
+        if k % 2 == 0:
+            raise ValueError("Even root of a negative number")
+        root, exact = iroot(-x, k)
+        return (-root, exact)
+    if x < 2 or k == 1:
+        return (x, True)
+
+    root = 1 << -(-x.bit_length() // k)
+    while True:
+        estimate = ((k - 1) * root + x // root ** (k - 1)) // k
+        if estimate >= root:
+            break
+        root = estimate
+
+    return (root, root ** k == x)
+
+
+def crt(residues: Sequence[int], moduli: Sequence[int]) -> tuple[int, int]:
+    """Solve a system of congruences x = residues[i] (mod moduli[i]) with
+    the Chinese remainder theorem. The moduli must be pairwise coprime.
+
+    Parameters:
+        residues    Remainder modulo each modulus
+        moduli      Pairwise coprime moduli
+
+    Returns:
+        Returns the smallest non-negative solution and the product of
+        the moduli.
+    """
+    if len(residues) != len(moduli):
+        raise ValueError("CRT needs one residue for every modulus")
+
+    x, product = 0, 1
+    for residue, modulus in zip(residues, moduli):
+        step = (residue - x) * invmod(product, modulus) % modulus
+        x += product * step
+        product *= modulus
+
+    return (x, product)
+
+
+def is_probable_prime(n: int, rounds: int = 32) -> bool:
+    """Miller-Rabin primality test. Small factors are ruled out by trial
+    division first. Numbers below DETERMINISTIC_LIMIT are tested with a
+    fixed set of bases which makes the answer certain.
+
+    Parameters:
+        n           Integer to test
+        rounds      Number of random bases for large n
+
+    Returns:
+        Returns True if n is (probably) prime.
+    """
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    if n < DETERMINISTIC_LIMIT:
+        bases = DETERMINISTIC_BASES
+    else:
+        bases = [secrets.randbelow(n - 3) + 2 for _ in range(rounds)]
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def random_prime(bits: int) -> int:
+    """Generate a random prime with exactly the given number of bits. The
+    top two bits are set, so the product of two such primes has exactly
+    twice as many bits.
+
+    Parameters:
+        bits        Size of the prime in bits
+
+    Returns:
+        Returns the prime.
+    """
+    if bits < 2:
+        raise ValueError(f"Invalid prime size ({bits} bits)")
+
+    top = 3 << (bits - 2) if bits > 2 else 2
+    while True:
+        candidate = secrets.randbits(bits) | top | 1
+        if is_probable_prime(candidate):
+            return candidate
+
+
+class FixedBaseExp(object):
+    """Modular exponentiation with a fixed base and modulus, such as a
+    Diffie-Hellman generator. The powers base**(d * 2**(window*i)) for
+    every digit d and window position i are computed once, after which
+    every exponentiation is at most one multiplication per window of the
+    exponent and no squarings at all.
+    """
+    def __init__(
+            self,
+            base: int,
+            modulus: int,
+            maxbits: int|None = None,
+            window: int = 5
+    ) -> None:
+        if modulus < 2:
+            raise ValueError(f"Invalid modulus ({modulus})")
+        if window < 1:
+            raise ValueError(f"Invalid window size ({window})")
+
+        self.base = base % modulus
+        self.modulus = modulus
+        self.window = window
+        self.maxbits = modulus.bit_length() if maxbits is None else maxbits
+
+        self._table = []
+        power = self.base
+        for _ in range(-(-self.maxbits // window)):
+            row = [1, power]
+            for _ in range(2, 1 << window):
+                row.append(row[-1] * power % modulus)
+            self._table.append(row)
+            power = row[-1] * power % modulus
+
+    def __call__(self, exponent: int) -> int:
+        return self.pow(exponent)
+
+    def pow(self, exponent: int) -> int:
+        """Raise the base to a power.
+
+        Parameters:
+            exponent    Exponent; falls back to pow() if it is negative
+                        or longer than maxbits
+
+        Returns:
+            Returns base**exponent modulo the modulus.
+        """
+        if exponent < 0 or exponent.bit_length() > self.maxbits:
+            return pow(self.base, exponent, self.modulus)
+
+        modulus = self.modulus
+        mask = (1 << self.window) - 1
+        result = 1
+        for row in self._table:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                result = result * row[digit] % modulus
+            exponent >>= self.window
+
+        return result % modulus
+
+
+# Below this size, the built-in division is faster than recursive division.
+DIVISION_CUTOFF = 4000
+
+
+def _divmod_2n1n(a: int, b: int, n: int) -> tuple[int, int]:
+    """Divide a 2n-bit number by an n-bit number by splitting it into two
+    3n/2 by n divisions (Burnikel-Ziegler).
+
+    Parameters:
+        a           Dividend, less than b * 2**n
+        b           Divisor, exactly n bits long
+        n           Size of the divisor in bits
+
+    Returns:
+        Returns the quotient and remainder.
+    """
+    if n <= DIVISION_CUTOFF:
+        return divmod(a, b)
+
+    pad = n & 1
+    if pad:
+        a, b, n = a << 1, b << 1, n + 1
+
+    half = n >> 1
+    mask = (1 << half) - 1
+    b1, b2 = b >> half, b & mask
+    q1, r = _divmod_3n2n(a >> n, (a >> half) & mask, b, b1, b2, half)
+    q2, r = _divmod_3n2n(r, a & mask, b, b1, b2, half)
+
+    return ((q1 << half) | q2, r >> pad)
+
+
+def _divmod_3n2n(a12: int, a3: int, b: int, b1: int, b2: int, n: int) -> tuple[int, int]:
+    """Divide a 3n-bit number, given as its top 2n bits and bottom n bits,
+    by a 2n-bit number, given as its top and bottom n bits.
+
+    Parameters:
+        a12         Top 2n bits of the dividend, less than b
+        a3          Bottom n bits of the dividend
+        b           Divisor, exactly 2n bits long
+        b1          Top n bits of the divisor
+        b2          Bottom n bits of the divisor
+        n           Half the size of the divisor in bits
+
+    Returns:
+        Returns the quotient and remainder.
+    """
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _divmod_2n1n(a12, b1, n)
+
+    r = ((r << n) | a3) - q * b2
+    while r < 0:
+        q, r = q - 1, r + b
+    return (q, r)
+
+
+def fast_mod(a: int, b: int) -> int:
+    """Calculate a mod b for huge non-negative a and positive b. CPython
+    (before 3.12) divides in quadratic time, while this splits the
+    division into multiplications, which use Karatsuba.
+
+    Parameters:
+        a           Dividend
+        b           Divisor
+
+    Returns:
+        Returns a mod b.
+    """
+    n = b.bit_length()
+    if n <= DIVISION_CUTOFF or a < b:
+        return a % b
+
+    remainder = 0
+    mask = (1 << n) - 1
+    for shift in range((a.bit_length() - 1) // n * n, -1, -n):
+        _, remainder = _divmod_2n1n((remainder << n) | ((a >> shift) & mask), b, n)
+    return remainder
+
+
+def product_tree(values: Sequence[int]) -> list[list[int]]:
+    """Build a tree of products. The first level holds the values, and
+    each level above holds the products of pairs from the level below.
+
+    Parameters:
+        values      Integers to multiply
+
+    Returns:
+        Returns the levels of the tree, the full product last.
+    """
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([
+            level[i] * level[i+1] if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ])
+    return tree
+
+
+def batch_gcd(moduli: Sequence[int]) -> list[int]:
+    """Find factors shared between RSA moduli with Bernstein's batch GCD.
+    The product of all moduli is reduced down a remainder tree, which is
+    much faster than computing the GCD of every pair.
+
+    Parameters:
+        moduli      Moduli to check
+
+    Returns:
+        Returns gcd(n, product of the other moduli) for every modulus n.
+        Moduli which share no factors give 1.
+    """
+    if len(moduli) == 0:
+        return []
+
+    tree = product_tree(moduli)
+    remainders = tree.pop()
+    while tree:
+        level = tree.pop()
+        remainders = [fast_mod(remainders[i // 2], n * n) for i, n in enumerate(level)]
+
+    return [math.gcd(r // n, n) for r, n in zip(remainders, moduli)]
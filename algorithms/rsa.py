@@ -0,0 +1,210 @@
+"""rsa.py
+
+Implementation of textbook RSA with CRT decryption, PKCS#1 v1.5 encryption
+padding and the Hastad broadcast attack on small public exponents.
+"""
+
+
+import math
+import secrets
+
+from collections.abc import Sequence
+
+from algorithms.numbertheory import bytes_to_int, crt, int_to_bytes, invmod, iroot, random_prime
+
+
+class RsaKey(object):
+    """RSA key. Public keys only hold the modulus and public exponent.
+    Private keys generated from their primes also hold the CRT values,
+    which make decryption about four times faster.
+    """
+    def __init__(
+            self,
+            n: int,
+            e: int,
+            d: int|None = None,
+            p: int|None = None,
+            q: int|None = None
+    ) -> None:
+        if (p is None) != (q is None):
+            raise ValueError("Both primes are needed for CRT decryption")
+        if p is not None and p * q != n:
+            raise ValueError("RSA primes do not match the modulus")
+
+        self.n = n
+        self.e = e
+        self.d = d
+        self.p = p
+        self.q = q
+
+        if p is not None:
+            if d is None:
+                self.d = d = invmod(e, (p - 1) * (q - 1))
+            self._dp = d % (p - 1)
+            self._dq = d % (q - 1)
+            self._qinv = invmod(q, p)
+
+    @classmethod
+    def generate(cls, bits: int = 2048, e: int = 65537) -> "RsaKey":
+        """Generate a new private key.
+
+        Parameters:
+            bits        Size of the modulus in bits
+            e           Public exponent
+
+        Returns:
+            Returns the new key.
+        """
+        while True:
+            p = random_prime(bits - bits // 2)
+            q = random_prime(bits // 2)
+            if p != q and math.gcd(e, (p - 1) * (q - 1)) == 1:
+                return cls(p * q, e, p=p, q=q)
+
+    def __repr__(self) -> str:
+        kind = "public" if self.d is None else "private"
+        return f"RsaKey({self.n.bit_length()} bits, e={self.e}, {kind})"
+
+    @property
+    def size(self) -> int:
+        """Length of the modulus in bytes."""
+        return (self.n.bit_length() + 7) // 8
+
+    def public_key(self) -> "RsaKey":
+        """Get the public part of the key.
+
+        Returns:
+            Returns a key with only the modulus and public exponent.
+        """
+        return RsaKey(self.n, self.e)
+
+    def encrypt(self, m: int) -> int:
+        """RSA encryption (or signature verification) primitive.
+
+        Parameters:
+            m           Message representative, less than n
+
+        Returns:
+            Returns m**e modulo n.
+        """
+        if not 0 <= m < self.n:
+            raise ValueError("RSA message out of range")
+        return pow(m, self.e, self.n)
+
+    def decrypt(self, c: int) -> int:
+        """RSA decryption (or signing) primitive. If the primes are known,
+        the exponentiation is split into two half-size exponentiations
+        with half-size exponents and joined with Garner's formula.
+
+        Parameters:
+            c           Ciphertext representative, less than n
+
+        Returns:
+            Returns c**d modulo n.
+        """
+        if self.d is None:
+            raise ValueError("Decryption requires a private key")
+        if not 0 <= c < self.n:
+            raise ValueError("RSA ciphertext out of range")
+
+        if self.p is None:
+            return pow(c, self.d, self.n)
+
+        mp = pow(c, self._dp, self.p)
+        mq = pow(c, self._dq, self.q)
+        return mq + self.q * ((mp - mq) * self._qinv % self.p)
+
+    def encrypt_bytes(self, message: bytes) -> bytes:
+        """Encrypt bytes without padding.
+
+        Parameters:
+            message     Data to encrypt
+
+        Returns:
+            Returns the ciphertext, as long as the modulus.
+        """
+        return int_to_bytes(self.encrypt(bytes_to_int(message)), self.size)
+
+    def decrypt_bytes(self, ciphertext: bytes) -> bytes:
+        """Decrypt bytes without removing any padding.
+
+        Parameters:
+            ciphertext  Data to decrypt
+
+        Returns:
+            Returns the plaintext, as long as the modulus.
+        """
+        return int_to_bytes(self.decrypt(bytes_to_int(ciphertext)), self.size)
+
+
+def pkcs1_pad(message: bytes, size: int) -> bytes:
+    """Apply PKCS#1 v1.5 encryption padding (block type 2):
+    00 02 <at least 8 random non-zero bytes> 00 <message>.
+
+    Parameters:
+        message     Data to pad
+        size        Length of the modulus in bytes
+
+    Returns:
+        Returns the padded message.
+    """
+    count = size - len(message) - 3
+    if count < 8:
+        raise ValueError(f"Message too long for a {size} byte PKCS#1 block")
+
+    padding = bytearray()
+    while len(padding) < count:
+        padding.extend(b for b in secrets.token_bytes(count - len(padding)) if b)
+    return b"\x00\x02" + bytes(padding) + b"\x00" + message
+
+
+def pkcs1_conforming(padded: bytes) -> bool:
+    """Check whether a block starts like PKCS#1 v1.5 encryption padding.
+    This is the check a Bleichenbacher padding oracle leaks.
+
+    Parameters:
+        padded      Decrypted block, as long as the modulus
+
+    Returns:
+        Returns True if the block starts with 00 02.
+    """
+    return padded[:2] == b"\x00\x02"
+
+
+def pkcs1_unpad(padded: bytes) -> bytes:
+    """Remove PKCS#1 v1.5 encryption padding.
+
+    Parameters:
+        padded      Decrypted block, as long as the modulus
+
+    Returns:
+        Returns the message.
+    """
+    separator = padded.find(b"\x00", 2)
+    if not pkcs1_conforming(padded) or separator < 10:
+        raise ValueError("Invalid PKCS#1 v1.5 padding")
+    return padded[separator+1:]
+
+
+def broadcast_decrypt(ciphertexts: Sequence[int], moduli: Sequence[int], e: int = 3) -> int:
+    """Recover a message which was encrypted without padding under e
+    different public keys that all use the public exponent e. Combining
+    the ciphertexts with CRT gives m**e over the integers, so the
+    message is its integer e-th root.
+
+    Parameters:
+        ciphertexts Ciphertext under each key
+        moduli      Modulus of each key
+        e           Shared public exponent
+
+    Returns:
+        Returns the message.
+    """
+    if len(ciphertexts) < e:
+        raise ValueError(f"Broadcast attack needs at least {e} ciphertexts")
+
+    combined, _ = crt(ciphertexts[:e], moduli[:e])
+    message, exact = iroot(combined, e)
+    if not exact:
+        raise ValueError("Combined ciphertext is not a perfect power")
+    return message
@@ -0,0 +1,75 @@
+"""sha1.py
+
+Implementation of the Secure Hash Algorithm 1 (SHA-1) as defined by NIST in
+FIPS 180-4.
+"""
+
+
+import struct
+
+from algorithms.mdhash import MerkleDamgardHash
+
+
+BLOCK = struct.Struct(">16L")
+
+
+class Sha1(MerkleDamgardHash):
+    name = "SHA-1"
+    digest_size = 20
+    block_size = 64
+    byteorder = "big"
+    initial_state = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+
+    @classmethod
+    def _compress_blocks(cls, state: tuple[int, ...], data: bytes) -> tuple[int, ...]:
+        """Run the SHA-1 compression function over every block of data.
+
+        Parameters:
+            state       Hash state before the first block
+            data        Data to compress, a multiple of 64 bytes long
+
+        Returns:
+            Returns the hash state after the last block.
+        """
+        h0, h1, h2, h3, h4 = state
+
+        for words in BLOCK.iter_unpack(data):
+            w = list(words)
+            for i in range(16, 80):
+                x = w[i-3] ^ w[i-8] ^ w[i-14] ^ w[i-16]
+                w.append(((x << 1) | (x >> 31)) & 0xFFFFFFFF)
+
+            a, b, c, d, e = h0, h1, h2, h3, h4
+
+            for i in range(0, 20):
+                t = (((a << 5) | (a >> 27)) + (d ^ (b & (c ^ d))) + e + 0x5A827999 + w[i]) & 0xFFFFFFFF
+                a, b, c, d, e = t, a, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, c, d
+            for i in range(20, 40):
+                t = (((a << 5) | (a >> 27)) + (b ^ c ^ d) + e + 0x6ED9EBA1 + w[i]) & 0xFFFFFFFF
+                a, b, c, d, e = t, a, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, c, d
+            for i in range(40, 60):
+                t = (((a << 5) | (a >> 27)) + ((b & c) | (d & (b | c))) + e + 0x8F1BBCDC + w[i]) & 0xFFFFFFFF
+                a, b, c, d, e = t, a, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, c, d
+            for i in range(60, 80):
+                t = (((a << 5) | (a >> 27)) + (b ^ c ^ d) + e + 0xCA62C1D6 + w[i]) & 0xFFFFFFFF
+                a, b, c, d, e = t, a, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, c, d
+
+            h0 = (h0 + a) & 0xFFFFFFFF
+            h1 = (h1 + b) & 0xFFFFFFFF
+            h2 = (h2 + c) & 0xFFFFFFFF
+            h3 = (h3 + d) & 0xFFFFFFFF
+            h4 = (h4 + e) & 0xFFFFFFFF
+
+        return (h0, h1, h2, h3, h4)
+
+
+def sha1(data: bytes = b"") -> Sha1:
+    """Create a SHA-1 hash object, in the style of hashlib.sha1.
+
+    Parameters:
+        data        Initial data to hash
+
+    Returns:
+        Returns the new hash object.
+    """
+    return Sha1(data)
@@ -0,0 +1,313 @@
+"""bleichenbacher.py
+
+Bleichenbacher's 1998 adaptive chosen ciphertext attack against RSA with
+PKCS#1 v1.5 encryption padding. Given an oracle which says whether a
+ciphertext decrypts to something starting with 00 02, the plaintext is found
+by repeatedly multiplying the ciphertext by s**e and narrowing down the set
+of intervals the plaintext could be in. Searching for each s takes most of
+the oracle queries, so it can be spread over several processes.
+"""
+
+
+import itertools
+import secrets
+import time
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from algorithms.numbertheory import int_to_bytes, invmod
+from algorithms.rsa import RsaKey
+from parallel import bounded_map
+
+
+# Number of s values tried per task once the intervals are small, where a
+# match is usually found within the first few values.
+NARROW_CHUNKSIZE = 16
+
+
+class PaddingOracle(object):
+    """Local PKCS#1 v1.5 padding oracle. It only holds the private key, so
+    it can be pickled and sent to worker processes.
+    """
+    def __init__(self, key: RsaKey) -> None:
+        self.key = key
+        self._low = 2 << (8 * (key.size - 2))
+        self._high = 3 << (8 * (key.size - 2))
+
+    def __call__(self, ciphertext: int) -> bool:
+        """Check whether a ciphertext decrypts to a block starting with 00 02.
+
+        Parameters:
+            ciphertext  Ciphertext representative
+
+        Returns:
+            Returns True if the padding looks valid.
+        """
+        return self._low <= self.key.decrypt(ciphertext) < self._high
+
+
+def _ceil_div(a: int, b: int) -> int:
+    """Divide integers, rounding up.
+
+    Parameters:
+        a           Dividend
+        b           Divisor
+
+    Returns:
+        Returns the smallest integer which is at least a / b.
+    """
+    return -(-a // b)
+
+
+def merge_intervals(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping or touching inclusive integer intervals.
+
+    Parameters:
+        intervals   (low, high) pairs
+
+    Returns:
+        Returns the merged intervals, sorted by their lower bound.
+    """
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1] + 1:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+_ORACLE_STATE = None
+
+
+def _oracle_init(oracle: Callable[[int], bool], ciphertext: int, e: int, n: int) -> None:
+    """Set the oracle and ciphertext used by _search_ranges.
+
+    Parameters:
+        oracle      Padding oracle
+        ciphertext  Blinded ciphertext whose plaintext is being searched for
+        e           Public exponent
+        n           Modulus
+    """
+    global _ORACLE_STATE
+    _ORACLE_STATE = (oracle, ciphertext, e, n)
+
+
+def _search_ranges(ranges: list[tuple[int, int]]) -> tuple[int|None, int]:
+    """Try s values in order until the oracle accepts ciphertext * s**e.
+
+    Parameters:
+        ranges      Half-open (start, stop) ranges of s values
+
+    Returns:
+        Returns the first accepted s (None if there was none) and the
+        number of oracle queries made.
+    """
+    oracle, ciphertext, e, n = _ORACLE_STATE
+    queries = 0
+
+    for start, stop in ranges:
+        for s in range(start, stop):
+            queries += 1
+            if oracle(ciphertext * pow(s, e, n) % n):
+                return (s, queries)
+
+    return (None, queries)
+
+
+def _batch_ranges(ranges: Iterator[tuple[int, int]], size: int) -> Iterator[list[tuple[int, int]]]:
+    """Group ranges of s values into tasks of about size values each,
+    splitting ranges which are too long.
+
+    Parameters:
+        ranges      Half-open (start, stop) ranges of s values
+        size        Number of s values in each task
+
+    Returns:
+        Yields lists of ranges with size values in total (fewer for the
+        last one).
+    """
+    batch, count = [], 0
+    for start, stop in ranges:
+        while start < stop:
+            take = min(stop - start, size - count)
+            batch.append((start, start + take))
+            start += take
+            count += take
+            if count == size:
+                yield batch
+                batch, count = [], 0
+    if batch:
+        yield batch
+
+
+def _find_s(
+        ranges: Iterator[tuple[int, int]],
+        chunksize: int,
+        executor: Executor|None,
+        jobs: int
+) -> tuple[int, int]:
+    """Search ranges of s values for one the oracle accepts, in order if
+    serial, or a few tasks at a time across the executor.
+
+    Parameters:
+        ranges      Half-open (start, stop) ranges of s values, in the
+                    order they should be tried
+        chunksize   Number of s values tried by each task
+        executor    Executor whose workers were set up by _oracle_init
+                    (None to search in this process)
+        jobs        Number of workers in the executor
+
+    Returns:
+        Returns the accepted s and the number of oracle queries made.
+    """
+    batches = _batch_ranges(ranges, chunksize)
+    queries = 0
+    found = None
+
+    if executor is None:
+        for batch in batches:
+            found, count = _search_ranges(batch)
+            queries += count
+            if found is not None:
+                break
+    else:
+        for _, (found, count) in bounded_map(executor, _search_ranges, batches, jobs):
+            queries += count
+            if found is not None:
+                break
+
+    if found is None:
+        raise ValueError("No s value was accepted by the oracle")
+    return (found, queries)
+
+
+def _interval_ranges(a: int, b: int, s: int, n: int, bound: int) -> Iterator[tuple[int, int]]:
+    """Generate ranges of s values which may be accepted if the plaintext
+    is in [a, b] (step 2c of the paper). Only a few values per r can
+    work, and r grows until one does.
+
+    Parameters:
+        a, b        Bounds of the interval the plaintext is in
+        s           s value found in the previous iteration
+        n           Modulus
+        bound       2**(8*(k-2)) for a k byte modulus
+
+    Returns:
+        Yields half-open (start, stop) ranges of s values, without end.
+    """
+    for r in itertools.count(_ceil_div(2 * (b*s - 2*bound), n)):
+        yield (_ceil_div(2*bound + r*n, b), _ceil_div(3*bound + r*n, a))
+
+
+def _narrow(
+        intervals: list[tuple[int, int]],
+        s: int,
+        n: int,
+        bound: int
+) -> list[tuple[int, int]]:
+    """Narrow the intervals the plaintext may be in, given that m*s mod n
+    is PKCS#1 conforming (step 3 of the paper).
+
+    Parameters:
+        intervals   Inclusive (low, high) intervals the plaintext is in
+        s           s value accepted by the oracle
+        n           Modulus
+        bound       2**(8*(k-2)) for a k byte modulus
+
+    Returns:
+        Returns the merged intervals the plaintext can still be in.
+    """
+    narrowed = []
+    for a, b in intervals:
+        for r in range(_ceil_div(a*s - 3*bound + 1, n), (b*s - 2*bound) // n + 1):
+            low = max(a, _ceil_div(2*bound + r*n, s))
+            high = min(b, (3*bound - 1 + r*n) // s)
+            if low <= high:
+                narrowed.append((low, high))
+    return merge_intervals(narrowed)
+
+
+def bleichenbacher(
+        ciphertext: int,
+        public: RsaKey,
+        oracle: Callable[[int], bool],
+        jobs: int = 1,
+        chunksize: int = 1024,
+        progress: Callable[[int, int, int, float], None]|None = None
+) -> tuple[bytes, int]:
+    """Decrypt a ciphertext using a PKCS#1 v1.5 padding oracle.
+
+    Parameters:
+        ciphertext  Ciphertext to decrypt
+        public      Public key the ciphertext was encrypted with
+        oracle      Picklable callable which returns True if a ciphertext
+                    decrypts to a block starting with 00 02
+        jobs        Number of processes used to search for s values
+        chunksize   Number of s values tried by each task
+        progress    Called after every iteration with the iteration
+                    number, the total width of the remaining intervals,
+                    the number of queries so far and queries per second
+
+    Returns:
+        Returns the padded plaintext, as long as the modulus, and the
+        number of oracle queries made.
+    """
+    n, e = public.n, public.e
+    bound = 1 << (8 * (public.size - 2))
+    started = time.perf_counter()
+
+    # Step 1: blind the ciphertext until it is conforming. Ciphertexts of
+    # properly padded messages already are.
+    blind = 1
+    queries = 1
+    while not oracle(ciphertext * pow(blind, e, n) % n):
+        blind = secrets.randbelow(n - 2) + 2
+        queries += 1
+    blinded = ciphertext * pow(blind, e, n) % n
+
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(jobs, initializer=_oracle_init, initargs=(oracle, blinded, e, n))
+    else:
+        _oracle_init(oracle, blinded, e, n)
+
+    try:
+        intervals = [(2*bound, 3*bound - 1)]
+        s = _ceil_div(n, 3*bound) - 1
+        iteration = 0
+
+        while len(intervals) > 1 or intervals[0][0] != intervals[0][1]:
+            iteration += 1
+
+            if iteration == 1:
+                # Step 2a: try every s from the smallest that could work.
+                ranges = ((start, start + chunksize) for start in itertools.count(s + 1, chunksize))
+                s, count = _find_s(ranges, chunksize, executor, jobs)
+            else:
+                # Step 2c, and step 2b done as in Bardou et al. (2012): run
+                # the single interval search on every interval in turn,
+                # instead of trying every s after the previous one.
+                searches = [_interval_ranges(a, b, s, n, bound) for a, b in intervals]
+                ranges = itertools.chain.from_iterable(zip(*searches))
+                s, count = _find_s(ranges, NARROW_CHUNKSIZE, executor, jobs)
+
+            queries += count
+            intervals = _narrow(intervals, s, n, bound)
+            if not intervals:
+                raise ValueError("Oracle answers are inconsistent with the ciphertext")
+
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                width = sum(high - low + 1 for low, high in intervals)
+                progress(iteration, width, queries, queries / elapsed if elapsed > 0 else 0.0)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        else:
+            _oracle_init(None, 0, 0, 0)
+
+    plaintext = intervals[0][0] * invmod(blind, n) % n
+    return (int_to_bytes(plaintext, public.size), queries)
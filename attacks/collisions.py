@@ -0,0 +1,479 @@
+"""collisions.py
+
+Birthday collision search for iterated (Merkle-Damgard) hashes with a small
+state, such as the AES-based toy hashes used for multicollision and herding
+attacks. Collisions are found with a compact array-backed hash table, with
+Floyd's cycle finding in constant memory, or with distinguished points,
+which need little memory and split across processes. Chaining collisions
+gives 2**k messages which all hash to the same value (Joux multicollisions).
+"""
+
+
+import array
+import functools
+import itertools
+import os
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from parallel import bounded_map
+
+
+# A compression function maps a state and a message block to a new state
+# with the same length as the old one.
+Compression = Callable[[bytes, bytes], bytes]
+
+
+class AesCompression(object):
+    """Compression function which encrypts the message block with AES,
+    using the state padded with zeros as the key, and keeps the first few
+    bytes of the result as the new state.
+    """
+    def __call__(self, state: bytes, block: bytes) -> bytes:
+        # Imported here so that the rest of the module works without the
+        # cryptography package.
+        from algorithms.aes import AesCipher
+
+        return AesCipher(state.ljust(16, b"\x00")).encrypt(block)[:len(state)]
+
+
+def iterated_hash(compress: Compression, state: bytes, message: bytes, block_size: int = 16) -> bytes:
+    """Hash a message by compressing it one block at a time.
+
+    Parameters:
+        compress    Compression function
+        state       Initial state
+        message     Message to hash, a multiple of block_size long
+        block_size  Message block size
+
+    Returns:
+        Returns the final state.
+    """
+    if len(message) % block_size != 0:
+        raise ValueError(f"Message length must be a multiple of {block_size}")
+
+    for i in range(0, len(message), block_size):
+        state = compress(state, message[i:i+block_size])
+    return state
+
+
+class CompactTable(object):
+    """Hash table from integer keys (up to 63 bits) to integer values,
+    stored in two flat arrays with open addressing. Each entry takes 16
+    bytes of array space, compared to over 100 bytes for a dict of ints.
+    """
+    __slots__ = ("_keys", "_values", "_bits", "_count")
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._bits = max(4, (2 * capacity - 1).bit_length())
+        self._keys = array.array("Q", bytes(8 << self._bits))
+        self._values = array.array("Q", bytes(8 << self._bits))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the table arrays in bytes."""
+        return (len(self._keys) + len(self._values)) * 8
+
+    def _slot(self, key: int) -> int:
+        """Find the slot holding a key, or the empty slot where it goes.
+        Keys are stored plus one so that zero marks an empty slot.
+
+        Parameters:
+            key         Key to look for
+
+        Returns:
+            Returns the slot index.
+        """
+        stored = key + 1
+        mask = len(self._keys) - 1
+        slot = ((stored * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self._bits)
+        while self._keys[slot] not in (0, stored):
+            slot = (slot + 1) & mask
+        return slot
+
+    def get(self, key: int, default: int|None = None) -> int|None:
+        """Look up the value for a key.
+
+        Parameters:
+            key         Key to look up
+            default     Value returned if the key is missing
+
+        Returns:
+            Returns the value stored for the key.
+        """
+        slot = self._slot(key)
+        return self._values[slot] if self._keys[slot] else default
+
+    def setdefault(self, key: int, value: int) -> int:
+        """Insert a value unless the key is already in the table.
+
+        Parameters:
+            key         Key to insert
+            value       Value to insert
+
+        Returns:
+            Returns the value stored for the key, which is the existing
+            one if there was one.
+        """
+        if not 0 <= key < (1 << 63):
+            raise ValueError(f"CompactTable key out of range ({key})")
+
+        slot = self._slot(key)
+        if self._keys[slot]:
+            return self._values[slot]
+
+        self._keys[slot] = key + 1
+        self._values[slot] = value
+        self._count += 1
+
+        # Keep the table at most half full so probe sequences stay short.
+        if 2 * self._count > len(self._keys):
+            keys, values = self._keys, self._values
+            self._bits += 1
+            self._keys = array.array("Q", bytes(8 << self._bits))
+            self._values = array.array("Q", bytes(8 << self._bits))
+            for stored, old in zip(keys, values):
+                if stored:
+                    slot = self._slot(stored - 1)
+                    self._keys[slot] = stored
+                    self._values[slot] = old
+        return value
+
+
+_WALK_STATE = None
+
+
+def _walk_init(compress: Compression, state: bytes, salt: bytes) -> None:
+    """Set the function walked by _step and _dp_trails.
+
+    Parameters:
+        compress    Compression function
+        state       State the collision is searched for
+        salt        Filler which turns a state into a full message block
+    """
+    global _WALK_STATE
+    _WALK_STATE = (compress, state, salt)
+
+
+def _block(x: int, salt: bytes) -> bytes:
+    """Turn a walk value into a message block.
+
+    Parameters:
+        x           Walk value, at most 8 bytes
+        salt        Filler which pads the value to a full block
+
+    Returns:
+        Returns the message block.
+    """
+    return x.to_bytes(8, "big") + salt
+
+
+def _step(x: int) -> int:
+    """Compress the message block for x, giving the next walk value. The
+    compression function is the one set by _walk_init.
+
+    Parameters:
+        x           Current walk value
+
+    Returns:
+        Returns the next walk value, which is the new state as an integer.
+    """
+    compress, state, salt = _WALK_STATE
+    return int.from_bytes(compress(state, _block(x, salt)), "big")
+
+
+def _dp_trails(starts: range, dpbits: int, maxlength: int) -> tuple[list[tuple[int, int]], int]:
+    """Walk from each start until reaching a distinguished point, a value
+    whose low dpbits bits are zero.
+
+    Parameters:
+        starts      Start values
+        dpbits      Number of zero bits which make a point distinguished
+        maxlength   Trails longer than this are abandoned
+
+    Returns:
+        Returns (distinguished point, start) for every finished trail, and
+        the number of compression calls made.
+    """
+    mask = (1 << dpbits) - 1
+    trails = []
+    evaluations = 0
+
+    for start in starts:
+        x = start
+        for _ in range(maxlength):
+            x = _step(x)
+            evaluations += 1
+            if x & mask == 0:
+                trails.append((x, start))
+                break
+
+    return (trails, evaluations)
+
+
+def _trail_collision(first: int, second: int, dpbits: int) -> tuple[int, int, int]|None:
+    """Find where two trails which end at the same distinguished point
+    merge.
+
+    Parameters:
+        first       Start of the first trail
+        second      Start of the second trail
+        dpbits      Number of zero bits which make a point distinguished
+
+    Returns:
+        Returns the two different values with the same image and the
+        number of compression calls made, or None if one trail is part
+        of the other.
+    """
+    mask = (1 << dpbits) - 1
+    lengths = []
+    for x in (first, second):
+        length = 1
+        while (x := _step(x)) & mask != 0:
+            length += 1
+        lengths.append(length)
+
+    evaluations = sum(lengths)
+    x, y = first, second
+    for _ in range(lengths[0] - lengths[1]):
+        x = _step(x)
+    for _ in range(lengths[1] - lengths[0]):
+        y = _step(y)
+    evaluations += abs(lengths[0] - lengths[1])
+
+    if x == y:
+        return None
+
+    while True:
+        nx, ny = _step(x), _step(y)
+        evaluations += 2
+        if nx == ny:
+            return (x, y, evaluations)
+        x, y = nx, ny
+
+
+def _search_table(size: int) -> tuple[int, int, int, int]:
+    """Birthday search storing every image in a CompactTable.
+
+    Parameters:
+        size        State size in bytes
+
+    Returns:
+        Returns the two colliding walk values, the number of compression
+        calls made and the memory used by the search table in bytes.
+    """
+    table = CompactTable(1 << (4 * size))
+    for x in itertools.count():
+        y = table.setdefault(_step(x), x)
+        if y != x:
+            return (y, x, x + 1, table.nbytes)
+
+
+def _search_floyd(size: int) -> tuple[int|None, int|None, int, int]:
+    """Find a collision with Floyd's cycle finding, walking from zero.
+
+    Parameters:
+        size        State size in bytes
+
+    Returns:
+        Returns the two colliding walk values (None if zero is on the
+        cycle, so there is no collision to find), the number of
+        compression calls made and the memory used, which is zero.
+    """
+    tortoise, hare = _step(0), _step(_step(0))
+    evaluations = 3
+    while tortoise != hare:
+        tortoise, hare = _step(tortoise), _step(_step(hare))
+        evaluations += 3
+
+    # The walk has no tail if it started on the cycle.
+    tortoise = 0
+    if tortoise == hare:
+        return (None, None, evaluations, 0)
+
+    while True:
+        nt, nh = _step(tortoise), _step(hare)
+        evaluations += 2
+        if nt == nh:
+            return (tortoise, hare, evaluations, 0)
+        tortoise, hare = nt, nh
+
+
+def _search_dp(size: int, jobs: int, chunksize: int) -> tuple[int, int, int, int]:
+    """Find a collision with distinguished points. Trails are walked by
+    the workers and their end points are collected in a single table.
+
+    Parameters:
+        size        State size in bytes
+        jobs        Number of processes used to walk trails
+        chunksize   Number of trails walked by each task
+
+    Returns:
+        Returns the two colliding walk values, the number of compression
+        calls made and the memory used by the search table in bytes.
+    """
+    bits = 8 * size
+    dpbits = max(1, bits // 4)
+    maxlength = 20 << dpbits
+    table = CompactTable(1 << max(4, bits // 2 - dpbits + 1))
+    evaluations = 0
+
+    starts = (range(i, i + chunksize) for i in itertools.count(0, chunksize))
+
+    def merge(trails: list[tuple[int, int]]) -> tuple[int, int, int]|None:
+        nonlocal evaluations
+        for point, start in trails:
+            other = table.setdefault(point, start)
+            if other != start:
+                found = _trail_collision(other, start, dpbits)
+                if found is not None:
+                    evaluations += found[2]
+                    return found
+        return None
+
+    found = None
+    if jobs > 1:
+        walk = functools.partial(_dp_trails, dpbits=dpbits, maxlength=maxlength)
+        with ProcessPoolExecutor(jobs, initializer=_walk_init, initargs=_WALK_STATE) as executor:
+            for _, (trails, count) in bounded_map(executor, walk, starts, jobs):
+                evaluations += count
+                found = merge(trails)
+                if found is not None:
+                    break
+    else:
+        while found is None:
+            trails, count = _dp_trails(next(starts), dpbits, maxlength)
+            evaluations += count
+            found = merge(trails)
+
+    return (found[0], found[1], evaluations, table.nbytes)
+
+
+def find_collision(
+        compress: Compression,
+        state: bytes,
+        method: str = "dp",
+        block_size: int = 16,
+        jobs: int = 1,
+        chunksize: int = 256
+) -> tuple[bytes, bytes, dict[str, int]]:
+    """Find two different message blocks which compress to the same new
+    state. The supported search methods are:
+
+        table       Store every image in a CompactTable
+        floyd       Floyd's cycle finding, using no memory
+        dp          Distinguished points, optionally across processes
+
+    Parameters:
+        compress    Picklable compression function
+        state       Current state, at most 7 bytes
+        method      Search method
+        block_size  Message block size, at least 16
+        jobs        Number of processes used by the dp method
+        chunksize   Number of trails walked by each dp task
+
+    Returns:
+        Returns the two message blocks and a dict with the number of
+        compression calls ("evaluations") and the memory used by the
+        search tables in bytes ("memory").
+    """
+    if not 0 < len(state) <= 7:
+        raise ValueError(f"Collision search needs a state of 1 to 7 bytes, not {len(state)}")
+    if block_size < 16:
+        raise ValueError("Collision search needs blocks of at least 16 bytes")
+    if method not in ("table", "floyd", "dp"):
+        raise ValueError(f"Unrecognized collision search method '{method}'")
+
+    evaluations = 0
+    try:
+        while True:
+            # A new salt gives a new random function if a walk fails.
+            salt = os.urandom(block_size - 8)
+            _walk_init(compress, state, salt)
+
+            if method == "table":
+                found = _search_table(len(state))
+            elif method == "floyd":
+                found = _search_floyd(len(state))
+            else:
+                found = _search_dp(len(state), jobs, chunksize)
+
+            x, y, count, memory = found
+            evaluations += count
+            if x is not None:
+                break
+    finally:
+        _walk_init(None, b"", b"")
+
+    stats = {"evaluations": evaluations, "memory": memory}
+    return (_block(x, salt), _block(y, salt), stats)
+
+
+class Multicollision(object):
+    """A chain of k colliding block pairs. Picking either block of every
+    pair gives 2**k different messages with the same hash.
+    """
+    def __init__(
+            self,
+            pairs: list[tuple[bytes, bytes]],
+            state: bytes,
+            evaluations: int,
+            memory: int
+    ) -> None:
+        self.pairs = pairs
+        self.state = state
+        self.evaluations = evaluations
+        self.memory = memory
+
+    def __len__(self) -> int:
+        return 1 << len(self.pairs)
+
+    def messages(self) -> Iterator[bytes]:
+        """Iterate over every colliding message."""
+        for choice in itertools.product(*self.pairs):
+            yield b"".join(choice)
+
+
+def multicollision(
+        compress: Compression,
+        state: bytes,
+        k: int,
+        method: str = "dp",
+        block_size: int = 16,
+        jobs: int = 1
+) -> Multicollision:
+    """Generate 2**k messages which all hash to the same state, by
+    finding a collision from the state left by the previous one.
+
+    Parameters:
+        compress    Picklable compression function
+        state       Initial state, at most 7 bytes
+        k           Number of chained collisions
+        method      Collision search method (see find_collision)
+        block_size  Message block size
+        jobs        Number of processes used by the dp method
+
+    Returns:
+        Returns the Multicollision, including the total number of
+        compression calls and the peak memory used by a single search.
+    """
+    pairs = []
+    evaluations = 0
+    memory = 0
+
+    for _ in range(k):
+        first, second, stats = find_collision(compress, state, method, block_size, jobs)
+        pairs.append((first, second))
+        state = compress(state, first)
+        evaluations += stats["evaluations"]
+        memory = max(memory, stats["memory"])
+
+    return Multicollision(pairs, state, evaluations, memory)
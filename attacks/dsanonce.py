@@ -0,0 +1,166 @@
+"""dsanonce.py
+
+Recover DSA private keys from bad nonces. A signature made with a known
+nonce gives away the private key, so it is enough to find the nonce, either
+because two signatures share one (and so share r) or because it comes from a
+range small enough to search.
+"""
+
+
+import functools
+import time
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.dsa import DsaKey
+from algorithms.numbertheory import invmod
+from parallel import bounded_map
+
+
+def private_from_nonce(h: int, r: int, s: int, k: int, q: int) -> int:
+    """Calculate the private key from a signature and its nonce.
+
+    Parameters:
+        h           Message hash
+        r, s        Signature
+        k           Nonce used for the signature
+        q           Group order
+
+    Returns:
+        Returns the private key x.
+    """
+    return (s * k - h) * invmod(r, q) % q
+
+
+def repeated_nonces(signatures: Iterable[tuple[int, int, int]]) -> Iterator[tuple[tuple[int, int, int], tuple[int, int, int]]]:
+    """Find pairs of signatures which were made with the same nonce.
+    Those signatures have the same r, so signatures are indexed by r in a
+    single pass.
+
+    Parameters:
+        signatures  (message hash, r, s) tuples
+
+    Returns:
+        Yields pairs of signatures of different messages with the same r.
+    """
+    index = {}
+    for signature in signatures:
+        first = index.setdefault(signature[1], signature)
+        if first is not signature and first[0] != signature[0]:
+            yield (first, signature)
+
+
+def recover_repeated_nonce(
+        first: tuple[int, int, int],
+        second: tuple[int, int, int],
+        public: DsaKey
+) -> tuple[int, int]:
+    """Recover the nonce and private key from two signatures made with
+    the same nonce.
+
+    Parameters:
+        first       (message hash, r, s) of the first signature
+        second      (message hash, r, s) of the second signature
+        public      Public key of the signer
+
+    Returns:
+        Returns the nonce and private key.
+    """
+    (h1, r, s1), (h2, _, s2) = first, second
+    q = public.q
+
+    k = (h1 - h2) * invmod(s1 - s2, q) % q
+    x = private_from_nonce(h1, r, s1, k, q)
+    if pow(public.g, x, public.p) != public.y:
+        raise ValueError("Signatures do not share a nonce")
+    return (k, x)
+
+
+def _search_nonces(nonces: range, r: int, p: int, q: int, g: int) -> int|None:
+    """Search a range of nonces for one whose g**k gives r. Only the
+    first power is a full exponentiation; after that each candidate
+    costs one multiplication.
+
+    Parameters:
+        nonces      Nonces to try
+        r           Signature r value
+        p, q, g     Group parameters
+
+    Returns:
+        Returns the first matching nonce, or None if none was found.
+    """
+    if len(nonces) == 0:
+        return None
+
+    power = pow(g, nonces.start, p)
+    step = pow(g, nonces.step, p)
+    for k in nonces:
+        if power % q == r:
+            return k
+        power = power * step % p
+
+    return None
+
+
+def recover_small_nonce(
+        h: int,
+        r: int,
+        s: int,
+        public: DsaKey,
+        nonces: range,
+        jobs: int = 1,
+        chunksize: int = 1 << 16
+) -> tuple[int|None, int|None, float]:
+    """Recover the private key from a signature whose nonce was taken
+    from a small range. The search stops as soon as the nonce is found.
+
+    Parameters:
+        h           Message hash
+        r, s        Signature
+        public      Public key of the signer
+        nonces      Range of nonces to try
+        jobs        Number of processes used to search
+        chunksize   Number of nonces searched by each task
+
+    Returns:
+        Returns the nonce and private key (None if no nonce matched) along
+        with the number of nonces tried per second.
+    """
+    p, q, g = public.p, public.q, public.g
+    chunks = (nonces[i:i+chunksize] for i in range(0, len(nonces), chunksize))
+    started = time.perf_counter()
+    searched = 0
+    found = None
+
+    def check(k: int) -> bool:
+        # Several nonces can give the same r, but only one gives the key.
+        x = private_from_nonce(h, r, s, k, q)
+        return pow(g, x, p) == public.y
+
+    if jobs > 1:
+        search = functools.partial(_search_nonces, r=r, p=p, q=q, g=g)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for chunk, k in bounded_map(executor, search, chunks, jobs):
+                searched += len(chunk)
+                while k is not None and not check(k):
+                    k = _search_nonces(chunk[chunk.index(k)+1:], r, p, q, g)
+                if k is not None:
+                    found = k
+                    break
+    else:
+        for chunk in chunks:
+            k = _search_nonces(chunk, r, p, q, g)
+            while k is not None and not check(k):
+                k = _search_nonces(chunk[chunk.index(k)+1:], r, p, q, g)
+
+            searched += len(chunk) if k is None else chunk.index(k) + 1
+            if k is not None:
+                found = k
+                break
+
+    elapsed = time.perf_counter() - started
+    rate = searched / elapsed if elapsed > 0 else 0.0
+    if found is None:
+        return (None, None, rate)
+    return (found, private_from_nonce(h, r, s, found, q), rate)
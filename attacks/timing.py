@@ -0,0 +1,385 @@
+"""timing.py
+
+Timing leak attack against an HMAC check which compares signatures one byte
+at a time and exits early. Includes a local stand-in for the vulnerable web
+server, a client which times requests over a pool of connections, and robust
+statistics used to decide each signature byte with as few requests as
+possible.
+"""
+
+
+import asyncio
+import hashlib
+import hmac
+import math
+import random
+import statistics
+import time
+import urllib.parse
+
+from collections.abc import Iterator, Sequence
+
+
+def trimmed_median(samples: Sequence[float], trim: float = 0.2) -> float:
+    """Estimate the typical value of timing samples. Network and
+    scheduling noise only ever make requests slower, so the slowest
+    samples are dropped before taking the median.
+
+    Parameters:
+        samples     Timing samples
+        trim        Fraction of the slowest samples to drop
+
+    Returns:
+        Returns the median of the remaining samples.
+    """
+    if len(samples) == 0:
+        raise ValueError("Cannot estimate the median of no samples")
+
+    ordered = sorted(samples)
+    keep = max(1, len(ordered) - int(len(ordered) * trim))
+    return statistics.median(ordered[:keep])
+
+
+def median_absolute_deviation(samples: Sequence[float]) -> float:
+    """Calculate the median absolute deviation of samples, scaled to be a
+    robust estimate of the standard deviation.
+
+    Parameters:
+        samples     Timing samples
+
+    Returns:
+        Returns the scaled median absolute deviation.
+    """
+    center = statistics.median(samples)
+    return 1.4826 * statistics.median(abs(s - center) for s in samples)
+
+
+class TimingLeakServer(object):
+    """Local HTTP server which checks HMAC-SHA1 file signatures with an
+    artificial delay after every matching byte.
+
+    Requests look like GET /test?file=foo&signature=46b4ec58... and get a
+    200 response if the signature is valid, or 500 otherwise.
+    """
+    def __init__(
+            self,
+            key: bytes,
+            delay: float = 0.005,
+            signature_length: int = 20,
+            host: str = "127.0.0.1",
+            port: int = 0
+    ) -> None:
+        self.key = key
+        self.delay = delay
+        self.signature_length = signature_length
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def __aenter__(self) -> "TimingLeakServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def sign(self, filename: bytes) -> bytes:
+        """Calculate the valid signature for a file.
+
+        Parameters:
+            filename    File to sign
+
+        Returns:
+            Returns the signature.
+        """
+        return hmac.new(self.key, filename, hashlib.sha1).digest()[:self.signature_length]
+
+    async def insecure_compare(self, signature: bytes, expected: bytes) -> bool:
+        """Compare signatures one byte at a time, sleeping after every
+        byte which matches.
+
+        Parameters:
+            signature   Signature given by the client
+            expected    Valid signature
+
+        Returns:
+            Returns True if the signatures are equal.
+        """
+        if len(signature) != len(expected):
+            return False
+
+        for x, y in zip(signature, expected):
+            if x != y:
+                return False
+            await asyncio.sleep(self.delay)
+
+        return True
+
+    async def start(self) -> None:
+        """Start listening. If no port was given, a free port is chosen
+        and stored in the port attribute.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle requests on a connection, one after another, until the
+        client disconnects.
+
+        Parameters:
+            reader      Stream the requests are read from
+            writer      Stream the responses are written to
+        """
+        try:
+            while request := await reader.readline():
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+
+                _, target, _ = request.decode("latin-1").split(" ", 2)
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(target).query)
+
+                try:
+                    filename = query["file"][0].encode("utf-8")
+                    signature = bytes.fromhex(query["signature"][0])
+                    valid = await self.insecure_compare(signature, self.sign(filename))
+                except (KeyError, ValueError):
+                    valid = False
+
+                status = b"200 OK" if valid else b"500 Internal Server Error"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+class TimingClient(object):
+    """HTTP client which measures how long the server takes to answer
+    each request. Requests are spread over a pool of keep-alive
+    connections, each of which has one request in flight at a time, and
+    every request is timed from its own send until its response arrives.
+    """
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            connections: int = 16
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.connections = connections
+        self.requests = 0
+        self._pool = []
+
+    async def __aenter__(self) -> "TimingClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Open the connection pool."""
+        self._pool = [
+            await asyncio.open_connection(self.host, self.port)
+            for _ in range(self.connections)
+        ]
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        for _, writer in self._pool:
+            writer.close()
+        for _, writer in self._pool:
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._pool = []
+
+    async def _measure_connection(
+            self,
+            connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+            targets: Sequence[str],
+            order: Iterator[int]
+    ) -> list[tuple[int, int, float]]:
+        """Send requests over one connection, one at a time, until every
+        target has been taken. The connections share the order iterator,
+        so each target is sent by whichever connection is free first.
+
+        Parameters:
+            connection  Reader and writer of the connection
+            targets     Request paths, including the query string
+            order       Shared iterator over the target indices
+
+        Returns:
+            Returns the index, status code and response time of every
+            target sent over this connection.
+        """
+        reader, writer = connection
+        results = []
+
+        for index in order:
+            request = f"GET {targets[index]} HTTP/1.1\r\nHost: {self.host}\r\n\r\n"
+            started = time.perf_counter()
+            writer.write(request.encode("ascii"))
+            await writer.drain()
+
+            status = int((await reader.readline()).split(b" ", 2)[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            results.append((index, status, time.perf_counter() - started))
+            self.requests += 1
+
+        return results
+
+    async def measure(self, targets: Sequence[str]) -> list[tuple[int, float]]:
+        """Request every target and time the responses. The targets are
+        sent in a random order on every call, so that no target is
+        always sent at the same point in a round (such as first, while
+        the other connections are still starting up).
+
+        Parameters:
+            targets     Request paths, including the query string
+
+        Returns:
+            Returns the status code and response time for each target,
+            in the same order as the targets.
+        """
+        if not self._pool:
+            raise RuntimeError("TimingClient is not open")
+
+        order = list(range(len(targets)))
+        random.shuffle(order)
+        order = iter(order)
+
+        shares = await asyncio.gather(*[
+            self._measure_connection(connection, targets, order)
+            for connection in self._pool
+        ])
+
+        results = [None] * len(targets)
+        for share in shares:
+            for index, status, elapsed in share:
+                results[index] = (status, elapsed)
+        return results
+
+
+def _target(filename: str, signature: bytes) -> str:
+    """Build the request path which checks a file signature.
+
+    Parameters:
+        filename    File the signature is for
+        signature   Signature to check
+
+    Returns:
+        Returns the path, including the query string.
+    """
+    query = urllib.parse.urlencode({"file": filename, "signature": signature.hex()})
+    return f"/test?{query}"
+
+
+async def recover_signature(
+        client: TimingClient,
+        filename: str,
+        length: int = 20,
+        initial_samples: int = 3,
+        max_samples: int = 256,
+        confidence: float = 4.0,
+        trim: float = 0.2,
+        retries: int = 3
+) -> tuple[bytes|None, int]:
+    """Recover the valid signature for a file one byte at a time by
+    timing how long the server takes to reject each guess.
+
+    Every candidate byte is timed a few times. If the best candidate is
+    not clearly slower than the runner-up, the slowest quarter of the
+    candidates are timed again with twice as many samples, until one
+    candidate stands out or the sample limit is reached. The last byte
+    is found by looking for a 200 response. If no byte works there, an
+    earlier byte was wrong, so the previous byte is guessed again.
+
+    Parameters:
+        client          Open client for the server
+        filename        File whose signature to recover
+        length          Signature length in bytes
+        initial_samples Samples per candidate in the first round
+        max_samples     Samples per candidate before giving up on
+                        finding a clear winner
+        confidence      Number of standard errors the best candidate
+                        must be ahead of the runner-up
+        trim            Fraction of the slowest samples ignored
+        retries         Number of times an earlier byte may be guessed
+                        again
+
+    Returns:
+        Returns the recovered signature (None if it wasn't found) and
+        the number of requests made.
+    """
+    started = client.requests
+    known = b""
+    excluded = {}
+
+    while len(known) < length:
+        padding = b"\x00" * (length - len(known) - 1)
+        candidates = [c for c in range(256) if c not in excluded.get(known, set())]
+
+        # The last byte can't be timed, but the right one is accepted.
+        if len(known) == length - 1:
+            targets = [_target(filename, known + bytes([c])) for c in candidates]
+            results = await client.measure(targets)
+            for candidate, (status, _) in zip(candidates, results):
+                if status == 200:
+                    return (known + bytes([candidate]), client.requests - started)
+
+            if retries == 0 or len(known) == 0:
+                return (None, client.requests - started)
+
+            retries -= 1
+            excluded.setdefault(known[:-1], set()).add(known[-1])
+            known = known[:-1]
+            continue
+
+        samples = {c: [] for c in candidates}
+        active = list(candidates)
+        rounds = initial_samples
+
+        while True:
+            targets = [_target(filename, known + bytes([c]) + padding) for c in active]
+            results = await client.measure(targets * rounds)
+            for i, (_, elapsed) in enumerate(results):
+                samples[active[i % len(active)]].append(elapsed)
+
+            estimates = {c: trimmed_median(samples[c], trim) for c in active}
+            active.sort(key=lambda c: estimates[c], reverse=True)
+            if len(active) == 1:
+                break
+
+            # Standard error of a median is about 1.25 times that of a mean.
+            spread = statistics.median(median_absolute_deviation(samples[c]) for c in active)
+            best, second = active[0], active[1]
+            error = 1.25 * spread * math.sqrt(1 / len(samples[best]) + 1 / len(samples[second]))
+
+            if estimates[best] - estimates[second] > confidence * error:
+                break
+            if len(samples[best]) >= max_samples:
+                break
+
+            active = active[:max(2, len(active) // 4)]
+            rounds = len(samples[best])
+
+        known += bytes([active[0]])
+
+    return (None, client.requests - started)
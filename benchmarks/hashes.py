@@ -0,0 +1,92 @@
+"""hashes.py
+
+Throughput benchmark for the pure Python hash implementations, compared
+against hashlib, and for length extension forgery with and without sharing
+work between key lengths.
+
+Run with `python benchmarks/hashes.py`.
+"""
+
+import hashlib
+import os.path
+import sys
+import time
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.md4 import Md4
+from algorithms.sha1 import Sha1
+
+
+def measure(function) -> float:
+    """Time a single call of a function.
+
+    Parameters:
+        function    Function to call
+
+    Returns:
+        Returns the elapsed time in seconds.
+    """
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def bench_throughput(size: int) -> None:
+    """Compare the hashing speed of Sha1 and Md4 with hashlib.
+
+    Parameters:
+        size        Number of bytes to hash
+    """
+    data = os.urandom(size)
+    print(f"Hashing {size // 1024} KiB:")
+
+    for name, ours, reference in [
+        ("SHA-1", Sha1, hashlib.sha1),
+        ("MD4", Md4, None),
+    ]:
+        elapsed = measure(lambda: ours(data).digest())
+        print(f"    {name:6} {size / elapsed / 1e6:10.2f} MB/s")
+
+        if reference is not None:
+            elapsed = measure(lambda: reference(data).digest())
+            print(f"    {name:6} {size / elapsed / 1e6:10.2f} MB/s (hashlib)")
+
+
+def bench_length_extension(extension_size: int, keylengths: range) -> None:
+    """Compare forging one length extension per key length with sharing
+    the work between key lengths.
+
+    Parameters:
+        extension_size  Number of extra bytes in the extension
+        keylengths      Key lengths to forge for
+    """
+    key = os.urandom(keylengths.stop // 2)
+    message = b"comment1=cooking%20MCs;userdata=foo;comment2=%20like%20a%20pound%20of%20bacon"
+    extension = b";admin=true;" + b"A" * extension_size
+    print(f"Length extension, {len(extension)} byte extension, {len(keylengths)} key lengths:")
+
+    for name, hashtype in [("SHA-1", Sha1), ("MD4", Md4)]:
+        digest = hashtype(key + message).digest()
+
+        def naive() -> None:
+            for keylength in keylengths:
+                glue = hashtype.padding(keylength + len(message))
+                length = keylength + len(message) + len(glue)
+                forged = hashtype.from_digest(digest, length)
+                forged.update(extension)
+                forged.digest()
+
+        def shared() -> None:
+            for _ in hashtype.length_extensions(digest, message, extension, keylengths):
+                pass
+
+        print(f"    {name:6} {measure(naive) * 1000:10.2f} ms (separate)")
+        print(f"    {name:6} {measure(shared) * 1000:10.2f} ms (shared)")
+
+
+if __name__ == "__main__":
+    bench_throughput(1 << 20)
+    bench_length_extension(4096, range(0, 256))
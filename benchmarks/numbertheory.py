@@ -0,0 +1,129 @@
+"""numbertheory.py
+
+Benchmark for the number theory helpers, compared against the naive paths
+built on pow(): CRT against plain RSA decryption, fixed-base tables against
+pow() with the generator, Newton roots against binary search and batch GCD
+against pairwise GCD.
+
+Run with `python benchmarks/numbertheory.py`.
+"""
+
+import itertools
+import math
+import os.path
+import secrets
+import sys
+import time
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.dh import NIST_GENERATOR, NIST_PRIME
+from algorithms.numbertheory import FixedBaseExp, batch_gcd, iroot
+from algorithms.rsa import RsaKey
+
+
+def measure(function) -> float:
+    """Time a single call of a function.
+
+    Parameters:
+        function    Function to call
+
+    Returns:
+        Returns the elapsed time in seconds.
+    """
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def report(name: str, naive: float, fast: float) -> None:
+    """Print the times of a benchmark and the speedup.
+
+    Parameters:
+        name        Benchmark name
+        naive       Time taken by the straightforward version
+        fast        Time taken by the optimized version
+    """
+    print(f"    {name:24} {naive * 1000:10.2f} ms {fast * 1000:10.2f} ms {naive / fast:8.1f}x")
+
+
+def bench_rsa(bits: int, count: int) -> None:
+    """Compare RSA decryption with and without the CRT.
+
+    Parameters:
+        bits        Modulus size
+        count       Number of ciphertexts to decrypt
+    """
+    key = RsaKey.generate(bits)
+    plain = RsaKey(key.n, key.e, d=key.d)
+    ciphertexts = [secrets.randbelow(key.n) for _ in range(count)]
+
+    naive = measure(lambda: [plain.decrypt(c) for c in ciphertexts])
+    fast = measure(lambda: [key.decrypt(c) for c in ciphertexts])
+    report(f"RSA-{bits} decrypt x{count}", naive, fast)
+
+
+def bench_fixed_base(count: int) -> None:
+    """Compare pow() with a FixedBaseExp table for the NIST DH generator.
+
+    Parameters:
+        count       Number of exponentiations
+    """
+    exponents = [secrets.randbelow(NIST_PRIME) for _ in range(count)]
+
+    naive = measure(lambda: [pow(NIST_GENERATOR, e, NIST_PRIME) for e in exponents])
+    table = []
+    setup = measure(lambda: table.append(FixedBaseExp(NIST_GENERATOR, NIST_PRIME)))
+    fast = measure(lambda: [table[0](e) for e in exponents])
+    report(f"DH g**x x{count}", naive, fast)
+    print(f"    {'(table setup)':24} {'':13} {setup * 1000:10.2f} ms")
+
+
+def bench_iroot(bits: int, k: int, count: int) -> None:
+    """Compare integer roots by bisection with iroot.
+
+    Parameters:
+        bits        Size of the numbers to take the root of
+        k           Root degree
+        count       Number of roots
+    """
+    values = [secrets.randbits(bits) for _ in range(count)]
+
+    def bisect(x: int) -> int:
+        low, high = 0, 1 << (x.bit_length() // k + 1)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if pow(middle, k) <= x:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    naive = measure(lambda: [bisect(x) for x in values])
+    fast = measure(lambda: [iroot(x, k) for x in values])
+    report(f"Root k={k} {bits} bits x{count}", naive, fast)
+
+
+def bench_batch_gcd(bits: int, count: int) -> None:
+    """Compare the GCD of every pair of moduli with batch_gcd.
+
+    Parameters:
+        bits        Modulus size
+        count       Number of moduli
+    """
+    # Random odd numbers cost the same to reduce as real moduli.
+    moduli = [secrets.randbits(bits) | (1 << (bits - 1)) | 1 for _ in range(count)]
+
+    naive = measure(lambda: [math.gcd(a, b) for a, b in itertools.combinations(moduli, 2)])
+    fast = measure(lambda: batch_gcd(moduli))
+    report(f"GCD of {count} {bits}-bit moduli", naive, fast)
+
+
+if __name__ == "__main__":
+    print(f"    {'':24} {'naive':>13} {'fast':>13} {'speedup':>9}")
+    bench_rsa(2048, 50)
+    bench_fixed_base(200)
+    bench_iroot(3072, 3, 200)
+    bench_batch_gcd(1024, 2000)
@@ -5,26 +5,89 @@ utilities for various basic cryptography functions and data
 conversions.
 """
 
-import itertools
-import re
+import binascii
 import string
 
+from collections.abc import Iterable
+
 
 ALPHABET_BASE64 = \
     string.ascii_uppercase + string.ascii_lowercase + string.digits + "+/"
-BIT_COUNTS = bytes(bin(x).count("1") for x in range(256))
+ALPHABET_HEX = string.hexdigits
+XOR_TABLES = tuple(bytes(x ^ k for x in range(256)) for k in range(256))
+
+
+def _validate(data: str, alphabet: str, name: str) -> bytes:
+    """Check that a string is made up of only characters from the given
+    alphabet. The whole string is checked in one pass by deleting every
+    valid character and making sure nothing is left over.
+
+    Parameters:
+        data        String to validate
+        alphabet    All valid characters
+        name        Name of the encoding, used in error messages
+
+    Returns:
+        Returns the validated string encoded as ASCII bytes.
+    """
+    try:
+        raw = data.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError(f"Invalid character(s) in {name} string") from None
+
+    if len(raw) == 0 or raw.translate(None, alphabet.encode("ascii")):
+        raise ValueError(f"Invalid character(s) in {name} string")
+
+    return raw
+
+
+def _restore(cls: type, data: bytes) -> "BinData":
+    """Recreate a BinData object (of any subclass) from its bytes when
+    unpickling, without going through the subclass constructor.
+
+    Parameters:
+        cls         BinData class to create
+        data        Underlying bytes
+
+    Returns:
+        Returns the new object.
+    """
+    restored = cls.__new__(cls)
+    object.__setattr__(restored, "_data", data)
+    object.__setattr__(restored, "_hash", None)
+    return restored
 
 
 class BinData(object):
     """Base data object which contains all conversion and data model
-    methods.
+    methods. BinData is immutable, which means it can be hashed and used
+    in sets or as dictionary keys.
     """
+    __slots__ = ("_data", "_hash")
+
     def __init__(self, data: bytes) -> None:
         if not isinstance(data, bytes):
             dtype = type(data).__name__
             raise TypeError(f"BinData cannot be initialized with '{dtype}' type")
 
-        self._data = data
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_hash", None)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __reduce__(self) -> tuple:
+        return (_restore, (type(self), self._data))
+
+    def __copy__(self) -> "BinData":
+        # Immutable objects can be shared instead of copied.
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "BinData":
+        return self
 
     def __repr__(self) -> str:
         return self.to_hexstring()
@@ -38,7 +101,7 @@ class BinData(object):
 
     def __getitem__(self, key: int|slice) -> "BinData":
         if isinstance(key, int):
-            return BinData(bytes([self._data[key]]))
+            return SINGLE_BYTES[self._data[key]]
         return BinData(self._data[key])
 
     ## Data model - comparison.
@@ -50,6 +113,14 @@ class BinData(object):
     def __ne__(self, other: object):
         return not self.__eq__(other)
 
+    def __hash__(self) -> int:
+        # The data can never change, so the hash only needs to be calculated
+        # once. Equal BinData objects of different subclasses must hash the
+        # same, so only the underlying bytes are hashed.
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(self._data))
+        return self._hash
+
     ## Data model - numeric operators.
     def __add__(self, other: object) -> "BinData":
         if not isinstance(other, BinData):
@@ -63,16 +134,25 @@ class BinData(object):
             dtype = type(other).__name__
             raise TypeError(f"Unsupported operand type(s) for +: 'BinData' and '{dtype}'")
 
-        self._data += other._data
-        return self
+        # BinData is immutable, so in-place addition creates a new object.
+        return BinData(self._data + other._data)
 
     def __xor__(self, other: object) -> "BinData":
         if not isinstance(other, BinData):
             dtype = type(other).__name__
             raise TypeError(f"Unsupported operand type(s) for ^: 'BinData' and '{dtype}'")
 
-        xored = bytes([x ^ y for x, y in zip(self._data, itertools.cycle(other._data))])
-        return BinData(xored)
+        if len(other._data) == 0:
+            return BinData(b"")
+        if len(other._data) == 1:
+            return BinData(self._data.translate(XOR_TABLES[other._data[0]]))
+
+        # XOR the whole buffer at once by treating both operands as big
+        # integers, with the key repeated to the length of this data.
+        length = len(self._data)
+        key = other._data * (length // len(other._data) + 1)
+        xored = int.from_bytes(self._data, "big") ^ int.from_bytes(key[:length], "big")
+        return BinData(xored.to_bytes(length, "big"))
 
     ## Cryptogaphy methods.
     def hamming_distance(self, other: "BinData") -> int:
@@ -89,8 +169,8 @@ class BinData(object):
         if len(self._data) != len(other._data):
             raise ValueError("Cannot calculate Hamming distance for BinData objects with different lengths.")
 
-        diff = self ^ other
-        return sum(BIT_COUNTS[d] for d in diff._data)
+        diff = int.from_bytes(self._data, "big") ^ int.from_bytes(other._data, "big")
+        return diff.bit_count()
 
     ## Convertsion methods.
     def to_base64(self) -> str:
@@ -99,30 +179,7 @@ class BinData(object):
         Returns:
             Returns the equivalent base64 string.
         """
-        base64string = ""
-        remainder = len(self._data) % 3
-        chunks = [self._data[i:i+3] for i in range(0, len(self._data) - remainder, 3)]
-
-        for chunk in chunks:
-            raw = int.from_bytes(chunk, "big")
-
-            base64string += ALPHABET_BASE64[(raw & 0xFC0000) >> 18]
-            base64string += ALPHABET_BASE64[(raw & 0x03F000) >> 12]
-            base64string += ALPHABET_BASE64[(raw & 0x000FC0) >>  6]
-            base64string += ALPHABET_BASE64[(raw & 0x00003F) >>  0]
-
-        if remainder == 1:
-            raw = int.from_bytes(self._data[-1:], "big")
-            base64string += ALPHABET_BASE64[(raw & 0xFC) >> 2]
-            base64string += ALPHABET_BASE64[(raw & 0x03) << 4]
-        elif remainder == 2:
-            raw = int.from_bytes(self._data[-2:], "big")
-            base64string += ALPHABET_BASE64[(raw & 0xFC00) >> 10]
-            base64string += ALPHABET_BASE64[(raw & 0x03F0) >>  4]
-            base64string += ALPHABET_BASE64[(raw & 0x000F) <<  2]
-        base64string += "=" * ((3 - remainder) % 3)
-
-        return base64string
+        return binascii.b2a_base64(self._data, newline=False).decode("ascii")
 
     def to_bytes(self) -> bytes:
         """Convert the data to its bytes equivalent.
@@ -138,7 +195,7 @@ class BinData(object):
         Returns:
             Returns the equivalent hex string.
         """
-        return "".join([f"{i:02X}" for i in self._data])
+        return self._data.hex().upper()
 
     def to_string(self, encoding="ascii") -> str:
         """Convert the data to its string equivalent with the
@@ -153,42 +210,98 @@ class BinData(object):
         return self._data.decode("ascii")
 
 
+# Shared instances for every possible single byte. Indexing BinData with an
+# integer returns one of these instead of allocating a new object.
+SINGLE_BYTES = tuple(BinData(bytes([i])) for i in range(256))
+
+
+class BinDataBuilder(object):
+    """Mutable buffer used to accumulate BinData. Appending to a builder
+    takes amortized constant time, unlike adding BinData objects
+    together which copies all of the data every time.
+    """
+    __slots__ = ("_buffer",)
+
+    def __init__(self, data: BinData|None = None) -> None:
+        self._buffer = bytearray()
+
+        if data is not None:
+            self.append(data)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __iadd__(self, other: object) -> "BinDataBuilder":
+        if not isinstance(other, BinData):
+            dtype = type(other).__name__
+            raise TypeError(f"Unsupported operand type(s) for +=: 'BinDataBuilder' and '{dtype}'")
+
+        self._buffer += other._data
+        return self
+
+    def append(self, data: BinData) -> None:
+        """Append data to the end of the builder.
+
+        Parameters:
+            data        Data to append
+        """
+        if not isinstance(data, BinData):
+            dtype = type(data).__name__
+            raise TypeError(f"Cannot append '{dtype}' type to BinDataBuilder")
+
+        self._buffer += data._data
+
+    def extend(self, iterable: Iterable[BinData]) -> None:
+        """Append every element of an iterable to the end of the
+        builder.
+
+        Parameters:
+            iterable    Iterable of data to append
+        """
+        for data in iterable:
+            self.append(data)
+
+    def freeze(self) -> BinData:
+        """Convert the accumulated data to BinData. The builder is
+        emptied afterwards so its memory is released right away and the
+        data is only copied once.
+
+        Returns:
+            Returns the accumulated data as BinData.
+        """
+        frozen = BinData(bytes(self._buffer))
+        self._buffer = bytearray()
+        return frozen
+
+
 class Base64String(BinData):
+    __slots__ = ()
+
     def __init__(self, data: str) -> None:
-        if re.match(r"[0-9a-zA-Z+/]+", data) is None:
-            raise ValueError("Invlid character(s) in base64 string.")
         if len(data) % 4 != 0:
             raise ValueError("Given base64 string length is not a multiple of 4.")
 
-        binary = b""
-        data = data.rstrip("=")
-        chunks = [data[i:i+4] for i in range(0, len(data), 4)]
-
-        for chunk in chunks:
-            raw = 0
-            for c in chunk:
-                raw = (raw << 6) | ALPHABET_BASE64.index(c)
-
-            raw >>= (8 - 2*len(chunk))
-            binary += raw.to_bytes(len(chunk) - 1, "big")
+        raw = _validate(data.rstrip("="), ALPHABET_BASE64, "base64")
+        if len(data) - len(raw) > 2:
+            raise ValueError("Invalid padding in base64 string.")
 
-        super().__init__(binary)
+        super().__init__(binascii.a2b_base64(data))
 
 
 class HexString(BinData):
+    __slots__ = ()
+
     def __init__(self, data: str) -> None:
-        if re.match(r"[0-9a-fA-F]+", data) is None:
-            raise ValueError("Invalid character(s) in hex string")
-        if len(data) % 2 != 0:
+        raw = _validate(data, ALPHABET_HEX, "hex")
+        if len(raw) % 2 != 0:
             raise ValueError("Given hex string length is not a multiple of 2")
 
-        chunks = [data[i:i+2] for i in range(0, len(data), 2)]
-        binary = bytes([int(chunk, 16) for chunk in chunks])
-
-        super().__init__(binary)
+        super().__init__(bytes.fromhex(raw.decode("ascii")))
 
 
 class String(BinData):
+    __slots__ = ()
+
     def __init__(self, data: str, encoding: str = "ascii") -> None:
         super().__init__(data.encode(encoding))
 
@@ -0,0 +1,347 @@
+"""bindataarray.py
+
+Implementation of BinDataArray, a columnar container for many pieces of
+binary data. Useful for attacking ciphertexts which were all encrypted with
+the same keystream (fixed-nonce CTR, reused one time pads, repeating-key XOR)
+where every column of the data can be cracked on its own.
+"""
+
+import array
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from bindata import BinData, XOR_TABLES
+from evaluators import BYTE_SCORES_ENGLISH
+
+
+def single_byte_key_scores(
+        column: bytes,
+        scores: Sequence[float] = BYTE_SCORES_ENGLISH
+) -> list[float]:
+    """Score all 256 possible single-byte XOR keys for a column of data.
+    The column is only read once to build a histogram, then every key
+    is scored from the histogram, so the cost per key does not depend
+    on the length of the column.
+
+    Parameters:
+        column      Data encrypted with a single-byte XOR key
+        scores      Score for every plaintext byte value
+
+    Returns:
+        Returns a list of 256 scores (averaged per byte) indexed by key.
+    """
+    if len(column) == 0:
+        return [0.0] * 256
+
+    counts = list(Counter(column).items())
+    keyscores = []
+
+    for key in range(256):
+        table = XOR_TABLES[key]
+        keyscores.append(sum(scores[table[b]] * n for b, n in counts))
+
+    return [score / len(column) for score in keyscores]
+
+
+def single_byte_key_best_guess(
+        column: bytes,
+        scores: Sequence[float] = BYTE_SCORES_ENGLISH
+) -> tuple[int, float]:
+    """Find the single-byte XOR key which best decrypts a column of data.
+
+    Parameters:
+        column      Data encrypted with a single-byte XOR key
+        scores      Score for every plaintext byte value
+
+    Returns:
+        Returns the best key and its score.
+    """
+    keyscores = single_byte_key_scores(column, scores)
+    best_score = max(keyscores)
+    return (keyscores.index(best_score), best_score)
+
+
+class BinDataArray(object):
+    """Immutable collection of BinData rows stored column by column in a
+    single contiguous buffer. Rows may have different lengths; a column
+    only contains bytes from the rows that are long enough to reach it.
+    """
+    __slots__ = ("_buffer", "_offsets", "_lengths", "_order")
+
+    def __init__(self, rows: Iterable[BinData]) -> None:
+        rows = list(rows)
+        for row in rows:
+            if not isinstance(row, BinData):
+                dtype = type(row).__name__
+                raise TypeError(f"BinDataArray cannot contain '{dtype}' type")
+
+        # Rows are stored longest first so that each column is made up of
+        # the first few rows. Remember where each row originally was.
+        order = sorted(range(len(rows)), key=lambda i: len(rows[i]), reverse=True)
+        rows = [rows[i].to_bytes() for i in order]
+        lengths = array.array("Q", [len(row) for row in rows])
+
+        # Columns reached by the same rows form a rectangular tier, which
+        # is transposed on its own so that no row ever has to be padded.
+        buffer = bytearray(sum(lengths))
+        position = 0
+        rowcount = len(rows)
+        start = 0
+
+        while True:
+            while rowcount > 0 and lengths[rowcount - 1] <= start:
+                rowcount -= 1
+            if rowcount == 0:
+                break
+
+            end = lengths[rowcount - 1]
+            step = end - start
+            tier = b"".join(row[start:end] for row in rows[:rowcount])
+            size = len(tier)
+
+            # Loop over whichever side of the tier is shorter.
+            if rowcount < step:
+                for r in range(rowcount):
+                    buffer[position+r:position+size:rowcount] = tier[r*step:(r+1)*step]
+            else:
+                for c in range(step):
+                    buffer[position+c*rowcount:position+(c+1)*rowcount] = tier[c::step]
+
+            position += size
+            start = end
+
+        self._build(bytes(buffer), lengths, order)
+
+    @classmethod
+    def from_blocks(cls, data: BinData, blocksize: int) -> "BinDataArray":
+        """Split data into consecutive blocks, each of which becomes a row
+        of the array. The last row is shorter if the data length is not
+        a multiple of the block size. Column i of the array is every byte
+        of the data whose position is i modulo the block size.
+
+        Parameters:
+            data        Data to split
+            blocksize   Size of each row
+
+        Returns:
+            Returns the new BinDataArray.
+        """
+        if blocksize <= 0:
+            raise ValueError(f"Invalid block size ({blocksize})")
+
+        rowcount, remainder = divmod(len(data), blocksize)
+        lengths = array.array("Q", [blocksize] * rowcount)
+        if remainder:
+            lengths.append(remainder)
+            rowcount += 1
+
+        raw = data.to_bytes()
+        width = min(blocksize, len(raw))
+        buffer = b"".join(raw[column::blocksize] for column in range(width))
+
+        blocks = cls.__new__(cls)
+        blocks._build(buffer, lengths, range(rowcount))
+        return blocks
+
+    def _build(
+            self,
+            buffer: bytes,
+            lengths: array.array,
+            order: Sequence[int]
+    ) -> None:
+        """Store the column-major buffer and work out where each column
+        starts.
+
+        Parameters:
+            buffer      Every column joined together, in order
+            lengths     Length of each row, longest first
+            order       Original index of each row
+        """
+        offsets = array.array("Q", [0])
+        rowcount = len(lengths)
+        width = lengths[0] if lengths else 0
+
+        for column in range(width):
+            while lengths[rowcount - 1] <= column:
+                rowcount -= 1
+            offsets.append(offsets[-1] + rowcount)
+
+        self._buffer = buffer
+        self._offsets = offsets
+        self._lengths = lengths
+        self._order = array.array("Q", [0] * len(lengths))
+        for position, index in enumerate(order):
+            self._order[index] = position
+
+    def _derive(self, buffer: bytes) -> "BinDataArray":
+        """Create a new array with the same shape as this one.
+
+        Parameters:
+            buffer      Column-major data for the new array
+
+        Returns:
+            Returns the new BinDataArray.
+        """
+        derived = type(self).__new__(type(self))
+        derived._buffer = buffer
+        derived._offsets = self._offsets
+        derived._lengths = self._lengths
+        derived._order = self._order
+        return derived
+
+    def __repr__(self) -> str:
+        return f"BinDataArray(rows={len(self)}, width={self.width})"
+
+    ## Data model - sequence.
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __getitem__(self, key: int) -> BinData:
+        return self.row(key)
+
+    def __eq__(self, other: object):
+        if isinstance(other, BinDataArray):
+            return list(self.rows()) == list(other.rows())
+        return False
+
+    def __ne__(self, other: object):
+        return not self.__eq__(other)
+
+    @property
+    def width(self) -> int:
+        """Length of the longest row."""
+        return len(self._offsets) - 1
+
+    ## Access methods.
+    def column(self, index: int) -> BinData:
+        """Get a single column of the array.
+
+        Parameters:
+            index       Column index
+
+        Returns:
+            Returns the column as BinData.
+        """
+        if not -self.width <= index < self.width:
+            raise IndexError("BinDataArray column index out of range")
+
+        index %= self.width
+        return BinData(self._buffer[self._offsets[index]:self._offsets[index+1]])
+
+    def columns(self) -> Iterable[BinData]:
+        """Iterate over every column of the array."""
+        for index in range(self.width):
+            yield self.column(index)
+
+    def row(self, index: int) -> BinData:
+        """Get a single row of the array, in the order the rows were
+        originally given.
+
+        Parameters:
+            index       Row index
+
+        Returns:
+            Returns the row as BinData.
+        """
+        position = self._order[index]
+        length = self._lengths[position]
+        offsets = self._offsets
+
+        return BinData(bytes([self._buffer[offsets[i] + position] for i in range(length)]))
+
+    def rows(self) -> Iterable[BinData]:
+        """Iterate over every row of the array."""
+        for index in range(len(self)):
+            yield self.row(index)
+
+    ## Cryptography methods.
+    def histogram(self, index: int) -> list[int]:
+        """Count how many times each byte value appears in a column.
+
+        Parameters:
+            index       Column index
+
+        Returns:
+            Returns a list of 256 counts indexed by byte value.
+        """
+        counts = Counter(self.column(index).to_bytes())
+        return [counts[b] for b in range(256)]
+
+    def xor_columns(self, key: BinData) -> "BinDataArray":
+        """XOR every column of the array with a single byte of the key.
+        Column i is XORed with byte i of the key, and the key is repeated
+        if it is shorter than the array is wide.
+
+        Parameters:
+            key         Key to XOR the columns with
+
+        Returns:
+            Returns the XORed BinDataArray.
+        """
+        if len(key) == 0:
+            raise ValueError("Cannot XOR BinDataArray with an empty key")
+
+        keybytes = key.to_bytes()
+        columns = [
+            self._buffer[self._offsets[i]:self._offsets[i+1]].translate(
+                XOR_TABLES[keybytes[i % len(keybytes)]]
+            )
+            for i in range(self.width)
+        ]
+        return self._derive(b"".join(columns))
+
+    def recover_key(
+            self,
+            method: str = "english",
+            jobs: int = 1,
+            executor: Executor|None = None
+    ) -> tuple[BinData, float]:
+        """Find the XOR key byte for every column of the array, assuming
+        each row was encrypted with the same keystream. All 256 possible
+        key bytes are scored for every column. The supported evaluation
+        methods are:
+
+            english     Plaintext looks like English text
+
+        Parameters:
+            method      Evaluation method for the best guess
+            jobs        Number of processes used to crack the columns
+            executor    Existing executor used to crack the columns
+                        (overrides jobs)
+
+        Returns:
+            Returns the recovered key along with its score, which is the
+            average score of each decrypted byte.
+        """
+        if method == "english":
+            scores = BYTE_SCORES_ENGLISH
+        else:
+            raise ValueError(f"Unrecognized evaluation method '{method}'")
+
+        columns = [self.column(i).to_bytes() for i in range(self.width)]
+        if executor is not None:
+            guesses = list(executor.map(
+                single_byte_key_best_guess,
+                columns,
+                [scores] * len(columns)
+            ))
+        elif jobs > 1 and len(columns) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                return self.recover_key(method, executor=executor)
+        else:
+            guesses = [single_byte_key_best_guess(c, scores) for c in columns]
+
+        key = bytes(k for k, _ in guesses)
+        total = sum(score * len(c) for (_, score), c in zip(guesses, columns))
+        return (BinData(key), total / max(len(self._buffer), 1))
+
+    def to_bytes(self) -> bytes:
+        """Convert the array to a single bytes object made up of all rows
+        joined together in their original order.
+
+        Returns:
+            Returns the joined rows.
+        """
+        return b"".join(row.to_bytes() for row in self.rows())
@@ -0,0 +1,552 @@
+"""cli.py
+
+Command line front end for bulk analysis. Run with `python -m cli --help` for
+a list of commands. All input is read from files (or stdin) and processed in
+chunks, so inputs don't need to fit in memory. Modules are imported only by
+the commands that need them to keep startup fast.
+"""
+
+import argparse
+import math
+import sys
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import BinaryIO
+
+
+CHUNK_SIZE = 1 << 20
+
+# Number of characters which encode a number of whole bytes for each format.
+FORMATS = {
+    "raw": (1, 1),
+    "hex": (2, 1),
+    "base64": (4, 3),
+}
+
+
+def _open_inputs(paths: Sequence[str]) -> Iterator[BinaryIO]:
+    """Open every input file in turn. A path of '-' is stdin.
+
+    Parameters:
+        paths       Input file paths
+
+    Returns:
+        Yields each opened file.
+    """
+    for path in paths or ["-"]:
+        if path == "-":
+            yield sys.stdin.buffer
+            continue
+
+        with open(path, "rb") as f:
+            yield f
+
+
+def _read_chunks(
+        paths: Sequence[str],
+        fmt: str,
+        alignment: int = 1,
+        chunksize: int|None = None
+) -> Iterator[bytes]:
+    """Read and decode input data in chunks. Whitespace is ignored in
+    text formats. Every chunk except the last decodes to a multiple of
+    alignment bytes.
+
+    Parameters:
+        paths       Input file paths
+        fmt         Input format
+        alignment   Decoded chunk size multiple
+        chunksize   Number of input bytes to read at once
+                    (default: CHUNK_SIZE)
+
+    Returns:
+        Yields decoded chunks of binary data.
+    """
+    chunksize = chunksize or CHUNK_SIZE
+    chars, size = FORMATS[fmt]
+    groupsize = math.lcm(size, alignment) // size * chars
+    carry = b""
+
+    for f in _open_inputs(paths):
+        while chunk := f.read(chunksize):
+            if fmt != "raw":
+                chunk = b"".join(chunk.split())
+
+            chunk = carry + chunk
+            cut = len(chunk) - len(chunk) % groupsize
+            carry = chunk[cut:]
+
+            if cut:
+                yield _decode(chunk[:cut], fmt)
+
+    if carry:
+        yield _decode(carry, fmt)
+
+
+def _decode(data: bytes, fmt: str) -> bytes:
+    """Decode input data from an input format.
+
+    Parameters:
+        data        Data to decode
+        fmt         Input format
+
+    Returns:
+        Returns the decoded binary data.
+    """
+    from bindata import Base64String, HexString
+
+    if fmt == "hex":
+        return HexString(data.decode("ascii")).to_bytes()
+    if fmt == "base64":
+        return Base64String(data.decode("ascii")).to_bytes()
+    return data
+
+
+def _encode(data: bytes, fmt: str) -> bytes:
+    """Encode binary data in an output format.
+
+    Parameters:
+        data        Data to encode
+        fmt         Output format
+
+    Returns:
+        Returns the encoded data.
+    """
+    from bindata import BinData
+
+    if fmt == "hex":
+        return BinData(data).to_hexstring().encode("ascii")
+    if fmt == "base64":
+        return BinData(data).to_base64().encode("ascii")
+    return data
+
+
+def _write_chunks(chunks: Iterable[bytes], fmt: str) -> None:
+    """Encode chunks of binary data and write them to stdout. Chunks can
+    have any length: bytes which don't fill a whole group of the output
+    format (3 bytes for base64) are carried over to the next chunk, so
+    padding only appears at the end. Text formats end with a newline.
+
+    Parameters:
+        chunks      Chunks of data to write
+        fmt         Output format
+    """
+    out = sys.stdout.buffer
+    size = FORMATS[fmt][1]
+    carry = b""
+
+    for chunk in chunks:
+        chunk = carry + chunk
+        cut = len(chunk) - len(chunk) % size
+        carry = chunk[cut:]
+
+        if cut:
+            out.write(_encode(chunk[:cut], fmt))
+
+    if carry:
+        out.write(_encode(carry, fmt))
+
+    if fmt != "raw":
+        out.write(b"\n")
+    out.flush()
+
+
+def _parse_key(key: str, fmt: str) -> bytes:
+    """Decode a key given on the command line.
+
+    Parameters:
+        key         Key argument
+        fmt         Key format
+
+    Returns:
+        Returns the decoded key.
+    """
+    from bindata import Base64String, HexString, String
+
+    return {
+        "string": String,
+        "hex": HexString,
+        "base64": Base64String,
+    }[fmt](key).to_bytes()
+
+
+def _read_lines(paths: Sequence[str], fmt: str) -> Iterator[tuple[int, bytes]]:
+    """Read and decode input one line at a time, skipping empty lines.
+
+    Parameters:
+        paths       Input file paths
+        fmt         Input format
+
+    Returns:
+        Yields the line number and decoded data of every line.
+    """
+    lineno = 0
+    for f in _open_inputs(paths):
+        for line in f:
+            lineno += 1
+            line = line.strip() if fmt != "raw" else line.rstrip(b"\r\n")
+
+            if line:
+                yield (lineno, _decode(line, fmt))
+
+
+def _pkcs7_pad(data: bytes, blocksize: int = 16) -> bytes:
+    """Add PKCS#7 padding. Data which is already a multiple of the block
+    size gets a whole block of padding, so the padding can always be
+    removed again.
+
+    Parameters:
+        data        Data to pad
+        blocksize   Block size
+
+    Returns:
+        Returns the padded data.
+    """
+    count = blocksize - len(data) % blocksize
+    return data + bytes([count]) * count
+
+
+def _pkcs7_unpad(data: bytes, blocksize: int = 16) -> bytes:
+    """Check and remove PKCS#7 padding.
+
+    Parameters:
+        data        Padded data
+        blocksize   Block size
+
+    Returns:
+        Returns the data without its padding.
+    """
+    count = data[-1] if data else 0
+    if len(data) % blocksize != 0 or not 1 <= count <= blocksize:
+        raise ValueError("Invalid PKCS#7 padding")
+    if data[-count:] != bytes([count]) * count:
+        raise ValueError("Invalid PKCS#7 padding")
+    return data[:-count]
+
+
+def _printable(data: bytes) -> str:
+    """Decode data for display, escaping anything that isn't ASCII.
+
+    Parameters:
+        data        Data to display
+
+    Returns:
+        Returns the escaped text.
+    """
+    return data.decode("latin-1").encode("unicode_escape").decode("ascii")
+
+
+## Commands.
+def command_convert(args: argparse.Namespace) -> int:
+    """Convert data from the input format to the output format.
+
+    Parameters:
+        args        Parsed command line arguments
+
+    Returns:
+        Returns the exit code.
+    """
+    alignment = FORMATS[args.output_format][1]
+    chunks = _read_chunks(args.inputs, args.input_format, alignment)
+    _write_chunks(chunks, args.output_format)
+    return 0
+
+
+def command_xor(args: argparse.Namespace) -> int:
+    """XOR data with a repeating key. The key carries on from where
+    the previous chunk left off, so chunks can have any length.
+
+    Parameters:
+        args        Parsed command line arguments
+
+    Returns:
+        Returns the exit code.
+    """
+    from bindata import BinData
+
+    key = _parse_key(args.key, args.key_format)
+    if len(key) == 0:
+        raise ValueError("XOR key cannot be empty")
+
+    alignment = FORMATS[args.output_format][1]
+
+    def xored() -> Iterator[bytes]:
+        offset = 0
+        for chunk in _read_chunks(args.inputs, args.input_format, alignment):
+            rotated = key[offset:] + key[:offset]
+            yield (BinData(chunk) ^ BinData(rotated)).to_bytes()
+            offset = (offset + len(chunk)) % len(key)
+
+    _write_chunks(xored(), args.output_format)
+    return 0
+
+
+def command_detect_ecb(args: argparse.Namespace) -> int:
+    """Print the line number and number of repeated blocks of every
+    input line which repeats a block, a sign of ECB encryption.
+
+    Parameters:
+        args        Parsed command line arguments
+
+    Returns:
+        Returns the exit code.
+    """
+    from bindata import BinData
+
+    out = sys.stdout
+    for lineno, data in _read_lines(args.inputs, args.input_format):
+        ciphertext = BinData(data)
+        blocks = [ciphertext[i:i+args.blocksize] for i in range(0, len(ciphertext), args.blocksize)]
+        repeats = len(blocks) - len(set(blocks))
+
+        if repeats > 0:
+            print(f"{lineno}\t{repeats}", file=out)
+
+    return 0
+
+
+def command_crack_single_xor(args: argparse.Namespace) -> int:
+    """Find the input lines most likely encrypted with single-byte XOR
+    and print the line number, key, score and plaintext of each.
+
+    Parameters:
+        args        Parsed command line arguments
+
+    Returns:
+        Returns the exit code.
+    """
+    import heapq
+    import itertools
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from bindataarray import single_byte_key_best_guess
+
+    lines = _read_lines(args.inputs, args.input_format)
+    best = []
+
+    def batches() -> Iterator[list[tuple[int, bytes]]]:
+        while batch := list(itertools.islice(lines, 1024)):
+            yield batch
+
+    def consider(batch: list[tuple[int, bytes]], guesses: Iterable[tuple[int, float]]) -> None:
+        for (lineno, data), (key, score) in zip(batch, guesses):
+            heapq.heappush(best, (score, -lineno, key, data))
+            if len(best) > args.top:
+                heapq.heappop(best)
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            for batch in batches():
+                consider(batch, executor.map(
+                    single_byte_key_best_guess,
+                    [data for _, data in batch],
+                    chunksize=max(1, len(batch) // args.jobs)
+                ))
+    else:
+        for batch in batches():
+            consider(batch, [single_byte_key_best_guess(data) for _, data in batch])
+
+    for score, lineno, key, data in sorted(best, reverse=True):
+        plaintext = bytes(b ^ key for b in data)
+        print(f"{-lineno}\t{key:02X}\t{score:.3f}\t{_printable(plaintext)}")
+
+    return 0
+
+
+def command_crack_repeating_xor(args: argparse.Namespace) -> int:
+    """Break repeating-key XOR encryption using a sample from the start
+    of the input. Prints the best keys, or with --decrypt, streams the
+    whole input decrypted with the best key.
+
+    Parameters:
+        args        Parsed command line arguments
+
+    Returns:
+        Returns the exit code.
+    """
+    from bindata import BinData
+    from utils import break_repeating_key_xor
+
+    chunks = _read_chunks(args.inputs, args.input_format)
+    sample = b""
+    for chunk in chunks:
+        sample += chunk
+        if len(sample) >= args.sample:
+            break
+
+    results = break_repeating_key_xor(
+        BinData(sample),
+        keysizes=range(args.min_keysize, args.max_keysize + 1),
+        top_n=args.top,
+        samplesize=None,
+        jobs=args.jobs
+    )
+    if not results:
+        print("Ciphertext is too short to crack", file=sys.stderr)
+        return 1
+
+    if not args.decrypt:
+        for key, _, score in results:
+            print(f"{key.to_hexstring()}\t{score:.3f}\t{_printable(key.to_bytes())}")
+        return 0
+
+    # Decrypt everything with the best key, including the rest of the input
+    # which was never read into memory.
+    key = results[0][0].to_bytes()
+
+    def decrypted() -> Iterator[bytes]:
+        yield results[0][1].to_bytes()
+        offset = len(sample) % len(key)
+        for chunk in chunks:
+            rotated = key[offset:] + key[:offset]
+            yield (BinData(chunk) ^ BinData(rotated)).to_bytes()
+            offset = (offset + len(chunk)) % len(key)
+
+    _write_chunks(decrypted(), args.output_format)
+    return 0
+
+
+def command_aes(args: argparse.Namespace) -> int:
+    """Encrypt or decrypt data with AES. The last chunk is held back so
+    that the padding can be added or removed.
+
+    Parameters:
+        args        Parsed command line arguments
+
+    Returns:
+        Returns the exit code.
+    """
+    from algorithms.aes import AesCipher, AesMode
+
+    key = _parse_key(args.key, args.key_format)
+    mode = AesMode[args.mode.upper()]
+    if mode != AesMode.ECB and not args.iv:
+        raise ValueError(f"An IV is required in {mode.name} mode")
+
+    iv = _parse_key(args.iv, args.key_format) if args.iv else None
+    cipher = AesCipher(key, mode, iv)
+
+    if args.operation == "encrypt":
+        context = cipher.cipher.encryptor()
+    else:
+        context = cipher.cipher.decryptor()
+
+    def processed() -> Iterator[bytes]:
+        previous = None
+        alignment = math.lcm(16, FORMATS[args.output_format][1])
+        for chunk in _read_chunks(args.inputs, args.input_format, alignment):
+            if previous is not None:
+                yield context.update(previous)
+            previous = chunk
+
+        last = previous or b""
+        if args.operation == "encrypt" and args.pad:
+            last = _pkcs7_pad(last)
+
+        last = context.update(last) + context.finalize()
+        if args.operation == "decrypt" and args.pad:
+            last = _pkcs7_unpad(last)
+        yield last
+
+    _write_chunks(processed(), args.output_format)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser.
+
+    Returns:
+        Returns the argument parser.
+    """
+    parser = argparse.ArgumentParser(prog="python -m cli", description=__doc__.split("\n\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(
+            name: str,
+            function,
+            help: str,
+            fmt: str = "raw",
+            output: bool = True
+    ):
+        command = commands.add_parser(name, help=help, description=help)
+        command.set_defaults(function=function)
+        command.add_argument("inputs", nargs="*", metavar="FILE", help="input files (default: stdin)")
+        command.add_argument("-f", "--from", dest="input_format", choices=FORMATS, default=fmt,
+                             help=f"input format (default: {fmt})")
+        if output:
+            command.add_argument("-t", "--to", dest="output_format", choices=FORMATS, default="raw",
+                                 help="output format (default: raw)")
+        return command
+
+    def add_key(command, required: bool = True):
+        command.add_argument("-k", "--key", required=required, help="encryption key")
+        command.add_argument("--key-format", choices=["string", "hex", "base64"], default="string",
+                             help="key format (default: string)")
+
+    def add_jobs(command):
+        command.add_argument("-j", "--jobs", type=int, default=1,
+                             help="number of worker processes (default: 1)")
+
+    add_command("convert", command_convert, "Convert data between formats.")
+
+    command = add_command("xor", command_xor, "XOR data with a repeating key.")
+    add_key(command)
+
+    command = add_command("detect-ecb", command_detect_ecb,
+                          "List lines containing repeated blocks.", "hex", output=False)
+    command.add_argument("-b", "--blocksize", type=int, default=16, help="block size (default: 16)")
+
+    command = add_command("crack-single-xor", command_crack_single_xor,
+                          "Find the lines most likely encrypted with single-byte XOR.", "hex", output=False)
+    command.add_argument("-n", "--top", type=int, default=1, help="number of lines to show (default: 1)")
+    add_jobs(command)
+
+    command = add_command("crack-repeating-xor", command_crack_repeating_xor,
+                          "Break repeating-key XOR encryption.", "base64")
+    command.add_argument("--min-keysize", type=int, default=2, help="smallest key size (default: 2)")
+    command.add_argument("--max-keysize", type=int, default=40, help="largest key size (default: 40)")
+    command.add_argument("-n", "--top", type=int, default=3, help="number of key sizes to crack (default: 3)")
+    command.add_argument("--sample", type=int, default=CHUNK_SIZE,
+                         help=f"number of bytes used for cracking (default: {CHUNK_SIZE})")
+    command.add_argument("-d", "--decrypt", action="store_true",
+                         help="output the plaintext for the best key instead of the key list")
+    add_jobs(command)
+
+    command = add_command("aes", command_aes, "Encrypt or decrypt data with AES.")
+    operation = command.add_mutually_exclusive_group(required=True)
+    operation.add_argument("-e", "--encrypt", dest="operation", action="store_const", const="encrypt",
+                           help="encrypt the input")
+    operation.add_argument("-d", "--decrypt", dest="operation", action="store_const", const="decrypt",
+                           help="decrypt the input")
+    command.add_argument("-m", "--mode", choices=["ecb", "cbc", "cfb", "ofb", "ctr"], default="ecb",
+                         help="block cipher mode (default: ecb)")
+    command.add_argument("--iv", help="initialization vector, in the same format as the key")
+    command.add_argument("--pad", action="store_true",
+                         help="PKCS#7 pad the plaintext when encrypting, and check and remove the padding "
+                              "when decrypting")
+    add_key(command)
+
+    return parser
+
+
+def main(argv: Sequence[str]|None = None) -> int:
+    """Run the command line interface.
+
+    Parameters:
+        argv        Command line arguments (default: sys.argv)
+
+    Returns:
+        Returns the exit code.
+    """
+    args = build_parser().parse_args(argv)
+
+    try:
+        return args.function(args)
+    except (OSError, ValueError) as e:
+        print(f"{args.command}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
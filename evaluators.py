@@ -15,6 +15,38 @@ from collections.abc import Sequence
 from bindata import BinData
 
 
+# Relative frequency (percent) of each letter in English text.
+ENGLISH_FREQUENCIES = {
+    "E": 12.70, "T": 9.06, "A": 8.17, "O": 7.51, "I": 6.97, "N": 6.75,
+    "S": 6.33, "H": 6.09, "R": 5.99, "D": 4.25, "L": 4.03, "C": 2.78,
+    "U": 2.76, "M": 2.41, "W": 2.36, "F": 2.23, "G": 2.02, "Y": 1.97,
+    "P": 1.93, "B": 1.49, "V": 0.98, "K": 0.77, "J": 0.15, "X": 0.15,
+    "Q": 0.10, "Z": 0.07,
+}
+
+
+def __byte_scores_english() -> tuple[float, ...]:
+    """Create a score for every possible byte value based on how likely
+    that byte is to show up in English text. Spaces and lowercase
+    letters score highest, non-printable bytes are heavily penalized.
+
+    Returns:
+        Returns a tuple of 256 scores indexed by byte value.
+    """
+    scores = [-100.0] * 256
+    for c in string.printable:
+        scores[ord(c)] = 0.0 if c.isspace() else 0.5
+    for letter, frequency in ENGLISH_FREQUENCIES.items():
+        scores[ord(letter.lower())] = frequency
+        scores[ord(letter.upper())] = frequency / 4
+    scores[ord(" ")] = 15.0
+
+    return tuple(scores)
+
+
+BYTE_SCORES_ENGLISH = __byte_scores_english()
+
+
 def __fibonacci_distribution(iterable: Sequence[object]) -> defaultdict[object, float]:
     """Creates a "Fibonacci" distribution for a given iterable. The
     distribution assigns a value to each element, and each element is
@@ -84,3 +116,22 @@ def evaluate_english(plaintext: BinData) -> float:
 
     return score
 
+
+def evaluate_english_bytes(plaintext: BinData) -> float:
+    """Evaluate the given plaintext as English text using only single
+    byte frequencies. This is less accurate than evaluate_english, but
+    it is much faster and works on data that isn't contiguous text, such
+    as every n-th byte of a message.
+
+    Parameters:
+        plaintext   The plaintext to evaluate
+
+    Returns:
+        Returns an evaluation score, averaged per byte.
+    """
+    if len(plaintext) == 0:
+        return 0.0
+
+    counts = Counter(plaintext.to_bytes())
+    score = sum(BYTE_SCORES_ENGLISH[b] * n for b, n in counts.items())
+    return score / len(plaintext)
@@ -0,0 +1,50 @@
+"""parallel.py
+
+Helpers for spreading a search over a pool of worker processes.
+"""
+
+
+import itertools
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+
+
+def bounded_map(
+        executor: Executor,
+        function: Callable,
+        tasks: Iterable,
+        jobs: int
+) -> Iterator[tuple[object, object]]:
+    """Run a function on every task in an executor, keeping at most two
+    tasks per job queued. Tasks are taken from the iterable only as
+    workers free up, so it may be endless, and a search can stop as soon
+    as it has what it needs. Closing the generator (for example by
+    breaking out of a loop over it) cancels every task still queued.
+
+    Parameters:
+        executor    Executor to run the tasks in
+        function    Picklable function called with each task
+        tasks       Tasks to run, read lazily
+        jobs        Number of workers in the executor
+
+    Returns:
+        Yields (task, result) as each task finishes, in the order they
+        finish.
+    """
+    tasks = iter(tasks)
+    pending = {}
+
+    try:
+        while True:
+            for task in itertools.islice(tasks, 2*jobs - len(pending)):
+                pending[executor.submit(function, task)] = task
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield (pending.pop(future), future.result())
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,71 @@
+"""test_bindata_builder.py
+
+Test the BinDataBuilder accumulation methods.
+"""
+
+import os.path
+import pytest
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from bindata import BinData, BinDataBuilder, HexString, String
+
+
+class TestBinDataBuilder(object):
+    def test_empty(self) -> None:
+        builder = BinDataBuilder()
+
+        assert len(builder) == 0
+        assert builder.freeze() == BinData(b"")
+
+    def test_initial(self) -> None:
+        builder = BinDataBuilder(String("Hello"))
+        builder.append(String(", World!"))
+
+        assert builder.freeze() == String("Hello, World!")
+
+    def test_append(self) -> None:
+        toadd = String("Hello, world!")
+        builder = BinDataBuilder()
+
+        for i in range(len(toadd)):
+            builder.append(toadd[i])
+            assert len(builder) == i + 1
+
+        assert builder.freeze() == toadd
+
+    def test_iadd(self) -> None:
+        builder = BinDataBuilder()
+        builder += HexString("0102")
+        builder += HexString("0304")
+
+        assert builder.freeze() == HexString("01020304")
+
+    def test_extend(self) -> None:
+        builder = BinDataBuilder()
+        builder.extend(String(c) for c in "Hello")
+        builder.extend([String(", "), String("World!")])
+
+        assert builder.freeze() == String("Hello, World!")
+
+    def test_freeze_resets(self) -> None:
+        builder = BinDataBuilder(String("first"))
+        first = builder.freeze()
+        builder.append(String("second"))
+
+        assert first == String("first")
+        assert builder.freeze() == String("second")
+
+    @pytest.mark.parametrize("data", [
+        b"bytes", "string", 0, None,
+    ])
+    def test_append_invalid(self, data: object) -> None:
+        builder = BinDataBuilder()
+
+        with pytest.raises(TypeError):
+            builder.append(data)
+        with pytest.raises(TypeError):
+            builder += data
@@ -43,6 +43,15 @@ class TestBase64String(object):
         # Invalid characters.
         "ThisIsAllValidSoFar?",
         "No Spaces Allowed!",
+        "?ThisIsAllValidLater",
+        "SGVsbG8s IFdvcmxkIQ=",
+        "SGVsbG8sIFdvcmxkIQé=",
+
+        # Invalid padding.
+        "AA=A",
+        "A===",
+        "====",
+        "",
     ])
     def test_constructor_invalid(self, data: str) -> None:
         with pytest.raises(ValueError):
@@ -59,6 +68,11 @@ class TestHexString(object):
     @pytest.mark.parametrize("data", [
         *["0" * i for i in range(1, 33, 2)],            # Uneven length
         *[f"{c}g" for c in "0123456789abcdefABCDEF"],   # One invalid char
+        *[f"g{c}" for c in "0123456789abcdefABCDEF"],   # Invalid first char
+        "0123456789abcdefABCDEFxx",                     # Invalid suffix
+        "01 23",                                        # Whitespace
+        "0é",                                           # Non-ASCII
+        "",                                             # Empty
     ])
     def test_constructor_invalid(self, data: str) -> None:
         with pytest.raises(ValueError):
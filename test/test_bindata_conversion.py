@@ -29,6 +29,17 @@ class TestBase64String(object):
             b"I'm killing your brain like a poisonous mushroom",
             "SSdtIGtpbGxpbmcgeW91ciBicmFpbiBsaWtlIGEgcG9pc29ub3VzIG11c2hyb29t"
         ),
+
+        # Every byte value.
+        (
+            bytes(range(256)),
+            "AAECAwQFBgcICQoLDA0ODxAREhMUFRYXGBkaGxwdHh8gISIjJCUmJygpKissLS4v"
+            "MDEyMzQ1Njc4OTo7PD0+P0BBQkNERUZHSElKS0xNTk9QUVJTVFVWV1hZWltcXV5f"
+            "YGFiY2RlZmdoaWprbG1ub3BxcnN0dXZ3eHl6e3x9fn+AgYKDhIWGh4iJiouMjY6P"
+            "kJGSk5SVlpeYmZqbnJ2en6ChoqOkpaanqKmqq6ytrq+wsbKztLW2t7i5uru8vb6/"
+            "wMHCw8TFxsfIycrLzM3Oz9DR0tPU1dbX2Nna29zd3t/g4eLj5OXm5+jp6uvs7e7v"
+            "8PHy8/T19vf4+fr7/P3+/w=="
+        ),
     ]
 
     @pytest.mark.parametrize("binary, base64string", TEST_CASES)
@@ -49,7 +60,10 @@ class TestHexString(object):
         (
             b"I'm killing your brain like a poisonous mushroom",
             "49276d206b696c6c696e6720796f757220627261696e206c696b65206120706f69736f6e6f7573206d757368726f6f6d"
-        )
+        ),
+
+        # Every byte value.
+        (bytes(range(256)), "".join(f"{i:02x}" for i in range(256))),
     ]
 
     @pytest.mark.parametrize("binary, hexstring", TEST_CASES)
@@ -3,8 +3,10 @@
 Test the BinData data model methods.
 """
 
+import copy
 import itertools
 import os.path
+import pickle
 import pytest
 import sys
 
@@ -41,6 +43,52 @@ class TestDataModelComparison(object):
         assert rhs != lhs
 
 
+class TestDataModelHash(object):
+    def test_hash_equal(self) -> None:
+        for lhs, rhs in itertools.product(TestDataModelComparison.EQUALS, repeat=2):
+            assert hash(lhs) == hash(rhs)
+
+    def test_hash_set(self) -> None:
+        blocks = [BinData(b"0123"), String("0123"), HexString("30313233"), BinData(b"3210")]
+
+        assert len(set(blocks)) == 2
+        assert String("3210") in set(blocks)
+        assert {BinData(b"0123"): 1}[HexString("30313233")] == 1
+
+    def test_immutable(self) -> None:
+        bindata = BinData(b"Hello, World!")
+
+        with pytest.raises(AttributeError):
+            bindata._data = b"Goodbye!"
+        with pytest.raises(AttributeError):
+            bindata.other = 0
+        with pytest.raises(AttributeError):
+            del bindata._data
+
+        assert bindata == BinData(b"Hello, World!")
+
+    def test_pickle_copy(self) -> None:
+        for bindata in [BinData(b"abc"), String("x"), HexString("0A0B"), Base64String("SGk="), BinData(b"")]:
+            for duplicate in [
+                pickle.loads(pickle.dumps(bindata)),
+                copy.copy(bindata),
+                copy.deepcopy(bindata),
+            ]:
+                assert type(duplicate) is type(bindata)
+                assert duplicate == bindata
+                assert hash(duplicate) == hash(bindata)
+
+        assert copy.deepcopy([String("x")]) == [String("x")]
+
+    def test_iadd_creates_new_object(self) -> None:
+        original = BinData(b"Hello")
+        bindata = original
+        bindata += String(", World!")
+
+        assert original == BinData(b"Hello")
+        assert bindata == BinData(b"Hello, World!")
+
+
 class TestDataModelNumeric(object):
     @pytest.mark.parametrize("lhs, rhs, expected", [
         (b"", b"", b""),
@@ -82,6 +130,12 @@ class TestDataModelNumeric(object):
         ("FF", "03", "FC"),
         ("FF", "C0", "3F"),
 
+        # Repeating and truncated keys.
+        ("000102", "FF", "FFFEFD"),
+        ("01020304", "FF00", "FE02FC04"),
+        ("0102030405", "FF00", "FE02FC04FA"),
+        ("01", "FFFFFF", "FE"),
+
         # Challenge 2.
         (
             "1c0111001f010100061a024b53535009181c",
@@ -106,6 +160,11 @@ class TestDataModelSequence(object):
         for i in range(len(original)):
             assert bindata[i] == String(original[i])
 
+        # Single bytes are shared instances.
+        for i in range(len(original)):
+            assert bindata[i] is String(original)[i]
+            assert bindata[i] is BinData(bytes([bindata.to_bytes()[i]]))[0]
+
         # Test access by slice.
         for i in range(2, len(original)):
             assert bindata[0:i] == String(original[0:i])
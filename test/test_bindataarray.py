@@ -0,0 +1,191 @@
+"""test_bindataarray.py
+
+Test the BinDataArray columnar container.
+"""
+
+import os
+import os.path
+import pytest
+import sys
+import tracemalloc
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from bindata import BinData, HexString, String
+from bindataarray import BinDataArray, single_byte_key_best_guess, single_byte_key_scores
+
+
+PLAINTEXTS = [
+    "I have met them at close of day",
+    "Coming with vivid faces",
+    "From counter or desk among grey",
+    "Eighteenth-century houses.",
+    "I have passed with a nod of the head",
+    "Or polite meaningless words,",
+    "Or have lingered awhile and said",
+    "Polite meaningless words,",
+    "And thought before I had done",
+    "Of a mocking tale or a gibe",
+    "To please a companion",
+    "Around the fire at the club,",
+    "Being certain that they and I",
+    "But lived where motley is worn:",
+    "All changed, changed utterly:",
+    "A terrible beauty is born.",
+    "That woman's days were spent",
+    "In ignorant good will,",
+    "Her nights in argument",
+    "Until her voice grew shrill.",
+    "What voice more sweet than hers",
+    "When young and beautiful,",
+    "She rode to harriers?",
+    "This man had kept a school",
+    "And rode our winged horse.",
+    "This other his helper and friend",
+    "Was coming into his force;",
+    "He might have won fame in the end,",
+    "So sensitive his nature seemed,",
+    "So daring and sweet his thought.",
+]
+
+
+class TestBinDataArray(object):
+    ROWS = [String("Hello"), String("Hi"), String(""), String("Greetings"), String("Hey")]
+
+    def test_shape(self) -> None:
+        array = BinDataArray(self.ROWS)
+
+        assert len(array) == 5
+        assert array.width == 9
+
+    def test_empty(self) -> None:
+        array = BinDataArray([])
+
+        assert len(array) == 0
+        assert array.width == 0
+        assert list(array.columns()) == []
+
+    def test_rows(self) -> None:
+        array = BinDataArray(self.ROWS)
+
+        assert list(array.rows()) == self.ROWS
+        assert array[3] == String("Greetings")
+        assert array.to_bytes() == b"HelloHiGreetingsHey"
+
+    def test_columns(self) -> None:
+        array = BinDataArray(self.ROWS)
+
+        # Columns list the longest rows first.
+        assert array.column(0) == String("GHHH")
+        assert array.column(1) == String("reei")
+        assert array.column(2) == String("ely")
+        assert array.column(4) == String("to")
+        assert array.column(5) == String("i")
+        assert array.column(-1) == String("s")
+
+        with pytest.raises(IndexError):
+            _ = array.column(9)
+
+    def test_ragged(self) -> None:
+        rows = [BinData(os.urandom(n)) for n in [3, 5000, 0, 17, 3, 200, 1]]
+        array = BinDataArray(rows)
+        ordered = sorted(rows, key=len, reverse=True)
+
+        assert list(array.rows()) == rows
+        for i in range(array.width):
+            assert array.column(i) == BinData(bytes(r.to_bytes()[i] for r in ordered if len(r) > i))
+
+    def test_ragged_memory(self) -> None:
+        rows = [BinData(os.urandom(200000))] + [BinData(os.urandom(10)) for _ in range(2000)]
+
+        # Rows must not be padded to the longest row while being stored,
+        # which would take about 400 MB here. Column offsets take 8 bytes
+        # per column.
+        tracemalloc.start()
+        try:
+            array = BinDataArray(rows)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 20 * 220000
+        assert array[0] == rows[0] and array[2000] == rows[2000]
+
+    def test_invalid(self) -> None:
+        with pytest.raises(TypeError):
+            _ = BinDataArray([b"bytes"])
+
+    @pytest.mark.parametrize("length, blocksize", [
+        (0, 4), (1, 4), (15, 4), (16, 4), (17, 4), (100, 29),
+    ])
+    def test_from_blocks(self, length: int, blocksize: int) -> None:
+        data = BinData(os.urandom(length))
+        blocks = BinDataArray.from_blocks(data, blocksize)
+        expected = [data[i:i+blocksize] for i in range(0, length, blocksize)]
+
+        assert list(blocks.rows()) == expected
+        assert blocks == BinDataArray(expected)
+        for i in range(blocks.width):
+            assert blocks.column(i) == data[i::blocksize]
+
+    def test_histogram(self) -> None:
+        array = BinDataArray(self.ROWS)
+        histogram = array.histogram(0)
+
+        assert sum(histogram) == 4
+        assert histogram[ord("H")] == 3
+        assert histogram[ord("G")] == 1
+
+    def test_xor_columns(self) -> None:
+        array = BinDataArray(self.ROWS)
+        key = HexString("0102030405060708090A")
+        xored = array.xor_columns(key)
+
+        assert list(xored.rows()) == [row ^ key[:len(row)] for row in self.ROWS]
+        assert xored.xor_columns(key) == array
+
+    def test_recover_key(self) -> None:
+        keystream = BinData(os.urandom(max(len(p) for p in PLAINTEXTS)))
+        ciphertexts = [String(p) ^ keystream[:len(p)] for p in PLAINTEXTS]
+        array = BinDataArray(ciphertexts)
+
+        key, score = array.recover_key()
+
+        # Only the first few columns have enough data to be reliable. The
+        # first column is all capital letters, which single byte frequencies
+        # can't tell apart from lowercase letters, so skip it too.
+        assert len(key) == array.width
+        assert key[1:16] == keystream[1:16]
+        assert score > 0
+
+        plaintexts = list(array.xor_columns(key).rows())
+        assert plaintexts[0][1:16] == String(PLAINTEXTS[0][1:16])
+
+    def test_recover_key_parallel(self) -> None:
+        keystream = BinData(os.urandom(max(len(p) for p in PLAINTEXTS)))
+        array = BinDataArray([String(p) ^ keystream[:len(p)] for p in PLAINTEXTS])
+
+        assert array.recover_key(jobs=2) == array.recover_key(jobs=1)
+
+    def test_recover_key_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            _ = BinDataArray(self.ROWS).recover_key(method="klingon")
+
+
+class TestSingleByteKey(object):
+    def test_scores(self) -> None:
+        ciphertext = String("etaoin shrdlu") ^ String("X")
+        scores = single_byte_key_scores(ciphertext.to_bytes())
+
+        assert len(scores) == 256
+        assert scores.index(max(scores)) == ord("X")
+        assert single_byte_key_scores(b"") == [0.0] * 256
+
+    def test_best_guess(self) -> None:
+        ciphertext = HexString("1b37373331363f78151b7f2b783431333d78397828372d363c78373e783a393b3736")
+        key, score = single_byte_key_best_guess(ciphertext.to_bytes())
+
+        assert key == ord("X")
+        assert score > 0
@@ -0,0 +1,54 @@
+"""test_bleichenbacher.py
+
+Test the Bleichenbacher PKCS#1 v1.5 padding oracle attack.
+"""
+
+import os.path
+import pytest
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.numbertheory import bytes_to_int
+from algorithms.rsa import RsaKey, pkcs1_pad, pkcs1_unpad
+from attacks.bleichenbacher import PaddingOracle, bleichenbacher, merge_intervals
+
+
+@pytest.fixture(scope="module")
+def key() -> RsaKey:
+    return RsaKey.generate(256, e=3)
+
+
+class TestMergeIntervals(object):
+    def test_merge(self) -> None:
+        assert merge_intervals([]) == []
+        assert merge_intervals([(5, 9), (1, 3), (4, 4), (20, 30), (22, 25)]) == [(1, 9), (20, 30)]
+        assert merge_intervals([(1, 2), (4, 5)]) == [(1, 2), (4, 5)]
+
+
+class TestBleichenbacher(object):
+    def test_oracle(self, key: RsaKey) -> None:
+        oracle = PaddingOracle(key)
+        assert oracle(key.encrypt(bytes_to_int(pkcs1_pad(b"hi", key.size))))
+        assert not oracle(key.encrypt(1))
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_bleichenbacher(self, key: RsaKey, jobs: int) -> None:
+        message = b"kick it, CC"
+        ciphertext = key.encrypt(bytes_to_int(pkcs1_pad(message, key.size)))
+        reports = []
+
+        padded, queries = bleichenbacher(
+            ciphertext,
+            key.public_key(),
+            PaddingOracle(key),
+            jobs=jobs,
+            progress=lambda *args: reports.append(args)
+        )
+
+        assert pkcs1_unpad(padded) == message
+        assert queries >= len(reports) > 0
+        assert reports[-1][1] == 1
+        assert [r[0] for r in reports] == list(range(1, len(reports) + 1))
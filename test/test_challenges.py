@@ -13,9 +13,10 @@ ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(ROOTDIR)
 
 from algorithms.aes import AesCipher
-from bindata import BinData, Base64String, HexString, String
+from bindata import BinDataBuilder, Base64String, HexString, String
 from evaluators import evaluate_english
 from utils import (
+    break_repeating_key_xor,
     read_challenge_data,
     normalized_hamming_distances,
     xor_otp_best_guess
@@ -124,22 +125,28 @@ class TestSet1(object):
         keysize = normalized[0][0]
 
         # Part 5 and 6
-        transposed = [BinData(b"") for _ in range(keysize)]
+        transposed = [BinDataBuilder() for _ in range(keysize)]
         for i in range(len(ciphertext)):
-            transposed[i % keysize] += ciphertext[i]
+            transposed[i % keysize].append(ciphertext[i])
 
         # Part 7 and 8
-        encryption_key = BinData(b"")
+        encryption_key = BinDataBuilder()
         keys = [String(c) for c in string.printable]
 
         for block in transposed:
-            key, _ = xor_otp_best_guess(block, keys)
-            encryption_key += key
+            key, _ = xor_otp_best_guess(block.freeze(), keys)
+            encryption_key.append(key)
 
-        assert encryption_key.to_string() == "Terminator X: Bring the noise"
+        assert encryption_key.freeze().to_string() == "Terminator X: Bring the noise"
         # Decrypted message is WAAAAAAY too long to check here. But if the
         # encryption key is correct, then the plaintext should be, too.
 
+        # All of the above in one call.
+        key, plaintext, _ = break_repeating_key_xor(ciphertext)[0]
+
+        assert key.to_string() == "Terminator X: Bring the noise"
+        assert plaintext.to_string().startswith("I'm back and I'm ringin' the bell \n")
+
     def test_challenge7(self) -> None:
         """Decrypt the given base64 string that's been encrypted via
         AES-128 in ECB mode with key 'YELLOW SUBMARINE'
@@ -166,16 +173,16 @@ class TestSet1(object):
         repeating = []
         for ciphertext in ciphertexts:
             blockrange = range(0, len(ciphertext), 16)
-            blocks = [ciphertext[i:i+16].to_bytes for i in blockrange]
+            blocks = [ciphertext[i:i+16] for i in blockrange]
 
             repeats = len(blocks) - len(set(blocks))
             repeating.append((repeats, ciphertext))
 
-        repeating.sort(key=lambda x: x[0])
+        repeating.sort(key=lambda x: x[0], reverse=True)
         ciphertext = repeating[0][1]
 
-        assert ciphertext[:8] == HexString("8A10247F90D0A055")
-        assert ciphertext[-8:] == HexString("78E803E1D995CE4D")
+        assert ciphertext[:8] == HexString("D880619740A8A19B")
+        assert ciphertext[-8:] == HexString("C58386B06FBA186A")
 
 
 class TestSet2(object):
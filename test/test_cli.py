@@ -0,0 +1,242 @@
+"""test_cli.py
+
+Test the command line front end.
+"""
+
+import os
+import os.path
+import pytest
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+import cli
+
+from bindata import Base64String, BinData, HexString, String
+
+
+CHALLENGE1_HEX = "49276d206b696c6c696e6720796f757220627261696e206c696b65206120706f69736f6e6f7573206d757368726f6f6d"
+CHALLENGE1_BASE64 = "SSdtIGtpbGxpbmcgeW91ciBicmFpbiBsaWtlIGEgcG9pc29ub3VzIG11c2hyb29t"
+
+PLAINTEXT = String(
+    "It was the best of times, it was the worst of times, it was the age of "
+    "wisdom, it was the age of foolishness, it was the epoch of belief, it "
+    "was the epoch of incredulity, it was the season of light, it was the "
+    "season of darkness, it was the spring of hope, it was the winter of "
+    "despair, we had everything before us, we had nothing before us, we were "
+    "all going direct to heaven, we were all going direct the other way - in "
+    "short, the period was so far like the present period, that some of its "
+    "noisiest authorities insisted on its being received, for good or for "
+    "evil, in the superlative degree of comparison only."
+)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read input a few bytes at a time to test chunk boundaries."""
+    monkeypatch.setattr(cli, "CHUNK_SIZE", 7)
+
+
+def write_input(tmp_path, data: bytes) -> str:
+    path = tmp_path / "input"
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestReadChunks(object):
+    @pytest.mark.parametrize("fmt, data", [
+        ("raw", bytes(range(256))),
+        ("hex", BinData(bytes(range(256))).to_hexstring().encode("ascii")),
+        ("base64", BinData(bytes(range(256))).to_base64().encode("ascii")),
+    ])
+    @pytest.mark.parametrize("alignment", [1, 3, 16])
+    def test_alignment(self, tmp_path, fmt: str, data: bytes, alignment: int) -> None:
+        path = write_input(tmp_path, data)
+        chunks = list(cli._read_chunks([path], fmt, alignment, chunksize=5))
+
+        assert b"".join(chunks) == bytes(range(256))
+        assert all(len(chunk) % alignment == 0 for chunk in chunks[:-1])
+
+    def test_whitespace(self, tmp_path) -> None:
+        data = b"\n".join(CHALLENGE1_BASE64[i:i+10].encode("ascii") for i in range(0, 64, 10))
+        path = write_input(tmp_path, data + b"\n")
+        chunks = list(cli._read_chunks([path], "base64", chunksize=4))
+
+        assert b"".join(chunks) == HexString(CHALLENGE1_HEX).to_bytes()
+
+    def test_multiple_files(self, tmp_path) -> None:
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.write_bytes(b"49276d")
+        second.write_bytes(b"206b69")
+        chunks = cli._read_chunks([str(first), str(second)], "hex")
+
+        assert b"".join(chunks) == b"I'm ki"
+
+
+class TestConvert(object):
+    @pytest.mark.parametrize("src, dst, data, expected", [
+        ("hex", "base64", CHALLENGE1_HEX, CHALLENGE1_BASE64 + "\n"),
+        ("base64", "hex", CHALLENGE1_BASE64, CHALLENGE1_HEX.upper() + "\n"),
+        ("base64", "raw", CHALLENGE1_BASE64, "I'm killing your brain like a poisonous mushroom"),
+        ("raw", "base64", "Hello, World!", "SGVsbG8sIFdvcmxkIQ==\n"),
+    ])
+    def test_convert(
+            self,
+            tmp_path,
+            capsysbinary,
+            small_chunks,
+            src: str,
+            dst: str,
+            data: str,
+            expected: str
+    ) -> None:
+        path = write_input(tmp_path, data.encode("ascii"))
+
+        assert cli.main(["convert", "-f", src, "-t", dst, path]) == 0
+        assert capsysbinary.readouterr().out == expected.encode("ascii")
+
+    def test_convert_invalid(self, tmp_path, capsys) -> None:
+        path = write_input(tmp_path, b"not hex")
+
+        assert cli.main(["convert", "-f", "hex", path]) == 1
+        assert "Invalid character" in capsys.readouterr().err
+
+
+class TestXor(object):
+    def test_xor(self, tmp_path, capsysbinary, small_chunks) -> None:
+        plaintext = "Burning 'em, if you ain't quick and nimble\nI go crazy when I hear a cymbal"
+        path = write_input(tmp_path, plaintext.encode("ascii"))
+
+        assert cli.main(["xor", "-k", "ICE", "-t", "hex", path]) == 0
+        assert capsysbinary.readouterr().out.decode("ascii").lower() == (
+            "0b3637272a2b2e63622c2e69692a23693a2a3c6324202d623d63343c"
+            "2a26226324272765272a282b2f20430a652e2c652a3124333a653e2b"
+            "2027630c692b20283165286326302e27282f\n"
+        )
+
+    def test_xor_hex_key(self, tmp_path, capsysbinary) -> None:
+        path = write_input(tmp_path, b"1c0111001f010100061a024b53535009181c")
+
+        assert cli.main([
+            "xor", "-f", "hex", "-k", "686974207468652062756c6c277320657965", "--key-format", "hex", path
+        ]) == 0
+        assert capsysbinary.readouterr().out == b"the kid don't play"
+
+
+class TestDetectEcb(object):
+    def test_detect_ecb(self, tmp_path, capsys) -> None:
+        lines = [
+            BinData(os.urandom(64)).to_hexstring(),
+            (BinData(os.urandom(16)) + BinData(16 * b"A") + BinData(16 * b"A")).to_hexstring(),
+            "",
+            BinData(os.urandom(64)).to_hexstring(),
+            BinData(32 * b"B").to_hexstring(),
+        ]
+        path = write_input(tmp_path, "\n".join(lines).encode("ascii"))
+
+        assert cli.main(["detect-ecb", path]) == 0
+        assert capsys.readouterr().out == "2\t1\n5\t1\n"
+
+
+class TestCrackSingleXor(object):
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_crack_single_xor(self, tmp_path, capsys, jobs: int) -> None:
+        lines = [BinData(os.urandom(34)).to_hexstring() for _ in range(20)]
+        lines[13] = "1b37373331363f78151b7f2b783431333d78397828372d363c78373e783a393b3736"
+        path = write_input(tmp_path, "\n".join(lines).encode("ascii"))
+
+        assert cli.main(["crack-single-xor", "-j", str(jobs), path]) == 0
+
+        lineno, key, _, plaintext = capsys.readouterr().out.rstrip("\n").split("\t")
+        assert lineno == "14"
+        assert key == "58"
+        assert plaintext == "Cooking MC's like a pound of bacon"
+
+    def test_crack_single_xor_top(self, tmp_path, capsys) -> None:
+        lines = [BinData(os.urandom(34)).to_hexstring() for _ in range(20)]
+        path = write_input(tmp_path, "\n".join(lines).encode("ascii"))
+
+        assert cli.main(["crack-single-xor", "-n", "5", path]) == 0
+        assert len(capsys.readouterr().out.splitlines()) == 5
+
+
+class TestCrackRepeatingXor(object):
+    def test_keys(self, tmp_path, capsys) -> None:
+        ciphertext = PLAINTEXT ^ String("YELLOW SUBMARINE")
+        path = write_input(tmp_path, ciphertext.to_base64().encode("ascii"))
+
+        assert cli.main(["crack-repeating-xor", path]) == 0
+
+        key, _, text = capsys.readouterr().out.splitlines()[0].split("\t")
+        assert HexString(key) == String("YELLOW SUBMARINE")
+        assert text == "YELLOW SUBMARINE"
+
+    def test_decrypt(self, tmp_path, capsysbinary, small_chunks) -> None:
+        ciphertext = PLAINTEXT ^ String("ICE")
+        path = write_input(tmp_path, ciphertext.to_bytes())
+
+        # Crack with only part of the ciphertext, then decrypt the rest.
+        assert cli.main(["crack-repeating-xor", "-f", "raw", "--sample", "400", "-d", path]) == 0
+        assert capsysbinary.readouterr().out == PLAINTEXT.to_bytes()
+
+    def test_decrypt_base64(self, tmp_path, capsysbinary, small_chunks) -> None:
+        ciphertext = PLAINTEXT ^ String("ICE")
+        path = write_input(tmp_path, ciphertext.to_bytes())
+
+        # Chunks that aren't multiples of 3 bytes must not add padding.
+        assert cli.main(["crack-repeating-xor", "-f", "raw", "--sample", "400", "-d", "-t", "base64", path]) == 0
+        output = capsysbinary.readouterr().out.decode("ascii").strip()
+        assert "=" not in output.rstrip("=")
+        assert Base64String(output) == PLAINTEXT
+
+
+class TestAes(object):
+    KEY = "YELLOW SUBMARINE"
+
+    @pytest.mark.parametrize("mode", ["ecb", "cbc", "ctr"])
+    def test_roundtrip(self, tmp_path, capsysbinary, small_chunks, mode: str) -> None:
+        iv = ["--iv", "0123456789ABCDEF"] if mode != "ecb" else []
+        path = write_input(tmp_path, PLAINTEXT.to_bytes())
+
+        assert cli.main(["aes", "-e", "-m", mode, "-k", self.KEY, *iv, "--pad", "-t", "base64", path]) == 0
+        ciphertext = capsysbinary.readouterr().out
+        assert "=" not in ciphertext.decode("ascii").strip().rstrip("=")
+        assert Base64String(ciphertext.decode("ascii").strip()) != PLAINTEXT
+
+        path = write_input(tmp_path, ciphertext)
+        assert cli.main(["aes", "-d", "-m", mode, "-k", self.KEY, *iv, "-f", "base64", path]) == 0
+        assert capsysbinary.readouterr().out.startswith(PLAINTEXT.to_bytes())
+
+        assert cli.main(["aes", "-d", "-m", mode, "-k", self.KEY, *iv, "--pad", "-f", "base64", path]) == 0
+        assert capsysbinary.readouterr().out == PLAINTEXT.to_bytes()
+
+    @pytest.mark.parametrize("length", [0, 5, 16, 32])
+    def test_padding(self, tmp_path, capsysbinary, length: int) -> None:
+        plaintext = os.urandom(length)
+        path = write_input(tmp_path, plaintext)
+
+        # Padding is always added, so aligned input gets a whole block.
+        assert cli.main(["aes", "-e", "-k", self.KEY, "--pad", path]) == 0
+        ciphertext = capsysbinary.readouterr().out
+        assert len(ciphertext) == (length // 16 + 1) * 16
+
+        path = write_input(tmp_path, ciphertext)
+        assert cli.main(["aes", "-d", "-k", self.KEY, "--pad", path]) == 0
+        assert capsysbinary.readouterr().out == plaintext
+
+    def test_invalid_padding(self, tmp_path, capsysbinary) -> None:
+        path = write_input(tmp_path, bytes(16))
+        assert cli.main(["aes", "-e", "-k", self.KEY, path]) == 0
+
+        path = write_input(tmp_path, capsysbinary.readouterr().out)
+        assert cli.main(["aes", "-d", "-k", self.KEY, "--pad", path]) == 1
+        assert b"padding" in capsysbinary.readouterr().err
+
+    def test_iv_required(self, tmp_path, capsys) -> None:
+        path = write_input(tmp_path, PLAINTEXT.to_bytes())
+
+        assert cli.main(["aes", "-e", "-m", "cbc", "-k", self.KEY, path]) == 1
+        assert "IV" in capsys.readouterr().err
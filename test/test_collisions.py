@@ -0,0 +1,79 @@
+"""test_collisions.py
+
+Test the birthday collision search and multicollisions.
+"""
+
+import hashlib
+import os.path
+import pytest
+import random
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from attacks.collisions import CompactTable, find_collision, iterated_hash, multicollision
+
+
+class ToyCompression(object):
+    """Cheap stand-in for the AES compression function."""
+    def __call__(self, state: bytes, block: bytes) -> bytes:
+        return hashlib.sha256(state + block).digest()[:len(state)]
+
+
+class TestCompactTable(object):
+    def test_setdefault(self) -> None:
+        rng = random.Random(0)
+        table = CompactTable(4)
+        reference = {}
+
+        for _ in range(5000):
+            key, value = rng.getrandbits(40), rng.getrandbits(64)
+            assert table.setdefault(key, value) == reference.setdefault(key, value)
+
+        assert len(table) == len(reference)
+        for key, value in reference.items():
+            assert key in table
+            assert table.get(key) == value
+        assert table.get(1 << 41) is None
+        assert table.nbytes < 64 * len(table)
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            CompactTable().setdefault(-1, 0)
+
+
+class TestFindCollision(object):
+    @pytest.mark.parametrize("method, jobs", [("table", 1), ("floyd", 1), ("dp", 1), ("dp", 2)])
+    def test_find_collision(self, method: str, jobs: int) -> None:
+        compress = ToyCompression()
+        state = b"\x12\x34\x56"
+
+        first, second, stats = find_collision(compress, state, method=method, jobs=jobs)
+        assert first != second
+        assert len(first) == len(second) == 16
+        assert compress(state, first) == compress(state, second)
+        assert stats["evaluations"] > 0
+
+        if method == "floyd":
+            assert stats["memory"] == 0
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            find_collision(ToyCompression(), b"\x00" * 8)
+        with pytest.raises(ValueError):
+            find_collision(ToyCompression(), b"\x00\x00", method="magic")
+
+
+class TestMulticollision(object):
+    def test_multicollision(self) -> None:
+        compress = ToyCompression()
+        state = b"\xAB\xCD"
+
+        result = multicollision(compress, state, 4)
+        messages = list(result.messages())
+        assert len(result) == len(messages) == 16
+        assert len(set(messages)) == 16
+        assert {iterated_hash(compress, state, m) for m in messages} == {result.state}
+        assert result.evaluations > 0 and result.memory > 0
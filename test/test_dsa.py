@@ -0,0 +1,67 @@
+"""test_dsa.py
+
+Test DSA signatures and nonce recovery.
+"""
+
+import os.path
+import pytest
+import random
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.dsa import DSA_G, DSA_P, DSA_Q, DsaKey, message_hash
+from attacks.dsanonce import recover_repeated_nonce, recover_small_nonce, repeated_nonces
+
+
+@pytest.fixture(scope="module")
+def key() -> DsaKey:
+    return DsaKey.generate()
+
+
+class TestDsa(object):
+    def test_parameters(self) -> None:
+        assert (DSA_P - 1) % DSA_Q == 0
+        assert pow(DSA_G, DSA_Q, DSA_P) == 1
+
+    def test_sign_verify(self, key: DsaKey) -> None:
+        message = b"For those that envy a MC it can be hazardous to your health"
+        signature = key.sign(message)
+
+        public = key.public_key()
+        assert public.verify(message, signature)
+        assert not public.verify(message + b"!", signature)
+        assert not public.verify(message, (signature[0], 0))
+        with pytest.raises(ValueError):
+            public.sign(message)
+
+
+class TestNonceRecovery(object):
+    def test_repeated_nonces(self, key: DsaKey) -> None:
+        rng = random.Random(0)
+        messages = [f"message {i}".encode("ascii") for i in range(20)]
+        nonces = [rng.randrange(1, DSA_Q) for _ in range(15)] + [1234567] * 5
+
+        signatures = [(message_hash(m), *key.sign(m, k)) for m, k in zip(messages, nonces)]
+        pairs = list(repeated_nonces(signatures))
+        assert len(pairs) == 4
+        assert all(first[1] == second[1] for first, second in pairs)
+
+        assert recover_repeated_nonce(*pairs[0], key.public_key()) == (1234567, key.x)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_small_nonce(self, key: DsaKey, jobs: int) -> None:
+        message = b"small nonce"
+        r, s = key.sign(message, 3000)
+
+        h = message_hash(message)
+        public = key.public_key()
+
+        k, x, rate = recover_small_nonce(h, r, s, public, range(1, 1 << 13), jobs=jobs, chunksize=1024)
+        assert (k, x) == (3000, key.x)
+        assert rate > 0
+
+        k, x, _ = recover_small_nonce(h, r, s, public, range(1, 2000))
+        assert (k, x) == (None, None)
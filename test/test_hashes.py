@@ -0,0 +1,155 @@
+"""test_hashes.py
+
+Test the Merkle-Damgard hash implementations.
+"""
+
+import hashlib
+import os
+import os.path
+import pytest
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.md4 import Md4, md4
+from algorithms.mdhash import MerkleDamgardHash
+from algorithms.sha1 import Sha1, sha1
+
+
+HASHES = [Sha1, Md4]
+
+
+class TestSha1(object):
+    @pytest.mark.parametrize("length", [0, 1, 3, 55, 56, 57, 63, 64, 65, 119, 120, 128, 1000])
+    def test_hashlib(self, length: int) -> None:
+        data = os.urandom(length)
+
+        assert sha1(data).digest() == hashlib.sha1(data).digest()
+        assert sha1(data).hexdigest() == hashlib.sha1(data).hexdigest()
+
+    @pytest.mark.parametrize("data, digest", [
+        (b"", "da39a3ee5e6b4b0d3255bfef95601890afd80709"),
+        (b"abc", "a9993e364706816aba3e25717850c26c9cd0d89d"),
+        (
+            b"abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq",
+            "84983e441c3bd26ebaae4aa1f95129e5e54670f1"
+        ),
+    ])
+    def test_vectors(self, data: bytes, digest: str) -> None:
+        assert Sha1(data).hexdigest() == digest
+
+
+class TestMd4(object):
+    @pytest.mark.parametrize("data, digest", [
+        (b"", "31d6cfe0d16ae931b73c59d7e0c089c0"),
+        (b"a", "bde52cb31de33e46245e05fbdbd6fb24"),
+        (b"abc", "a448017aaf21d8525fc10ae87aa6729d"),
+        (b"message digest", "d9130a8164549fe818874806e1c7014b"),
+        (b"abcdefghijklmnopqrstuvwxyz", "d79e1c308aa5bbcdeea8ed63df412da9"),
+        (
+            b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+            "043f8582f241db351ce627e153e7f0e4"
+        ),
+        (
+            b"12345678901234567890123456789012345678901234567890123456789012345678901234567890",
+            "e33b4ddc9c38f2199c3e7b164fcc0536"
+        ),
+    ])
+    def test_vectors(self, data: bytes, digest: str) -> None:
+        assert md4(data).hexdigest() == digest
+
+    def test_hashlib(self) -> None:
+        try:
+            reference = hashlib.new("md4")
+        except ValueError:
+            pytest.skip("hashlib does not support MD4")
+
+        data = os.urandom(1000)
+        reference.update(data)
+        assert Md4(data).digest() == reference.digest()
+
+
+class TestMerkleDamgard(object):
+    def test_abstract(self) -> None:
+        with pytest.raises(TypeError):
+            MerkleDamgardHash(b"x" * 64)
+
+    @pytest.mark.parametrize("hashtype", HASHES)
+    def test_update(self, hashtype) -> None:
+        data = os.urandom(1000)
+        h = hashtype()
+        for i in range(0, len(data), 37):
+            h.update(data[i:i+37])
+
+        assert h.digest() == hashtype(data).digest()
+
+        # Calculating the digest doesn't change the state.
+        assert h.digest() == hashtype(data).digest()
+
+    @pytest.mark.parametrize("hashtype", HASHES)
+    def test_copy(self, hashtype) -> None:
+        h = hashtype(b"A" * 100)
+        duplicate = h.copy()
+        duplicate.update(b"B")
+
+        assert h.digest() == hashtype(b"A" * 100).digest()
+        assert duplicate.digest() == hashtype(b"A" * 100 + b"B").digest()
+
+    @pytest.mark.parametrize("hashtype", HASHES)
+    def test_midstate(self, hashtype) -> None:
+        h = hashtype(b"A" * 150)
+        state, length = h.midstate()
+
+        assert length == 128
+        resumed = hashtype(state=state, length=length)
+        resumed.update(b"A" * 22 + b"B")
+        assert resumed.digest() == hashtype(b"A" * 150 + b"B").digest()
+
+        with pytest.raises(ValueError):
+            _ = hashtype(state=state, length=100)
+
+    @pytest.mark.parametrize("hashtype", HASHES)
+    @pytest.mark.parametrize("length", [0, 1, 55, 56, 64, 100])
+    def test_padding(self, hashtype, length: int) -> None:
+        padding = hashtype.padding(length)
+
+        assert (length + len(padding)) % hashtype.block_size == 0
+        assert padding[0] == 0x80
+        assert int.from_bytes(padding[-8:], hashtype.byteorder) == 8 * length
+
+    @pytest.mark.parametrize("hashtype", HASHES)
+    def test_from_digest(self, hashtype) -> None:
+        message = b"A" * 30
+        glue = hashtype.padding(len(message))
+        h = hashtype.from_digest(hashtype(message).digest(), len(message) + len(glue))
+        h.update(b"extension")
+
+        assert h.digest() == hashtype(message + glue + b"extension").digest()
+
+        with pytest.raises(ValueError):
+            _ = hashtype.from_digest(b"short", 64)
+
+    @pytest.mark.parametrize("hashtype", HASHES)
+    @pytest.mark.parametrize("extension", [
+        b";admin=true", b";admin=true" + b"A" * 100, b"B" * 128,
+    ])
+    def test_length_extensions(self, hashtype, extension: bytes) -> None:
+        """Challenges 29 and 30: forge a secret-prefix MAC."""
+        key = os.urandom(13)
+        message = b"comment1=cooking%20MCs;userdata=foo;comment2=%20like%20a%20pound%20of%20bacon"
+        mac = hashtype(key + message).digest()
+
+        forgeries = list(hashtype.length_extensions(mac, message, extension, range(32)))
+        assert [keylength for keylength, _, _ in forgeries] == list(range(32))
+
+        valid = [
+            keylength for keylength, forged, forged_mac in forgeries
+            if hashtype(key + forged).digest() == forged_mac
+        ]
+        assert valid == [len(key)]
+
+        _, forged, _ = forgeries[len(key)]
+        assert forged.startswith(message)
+        assert forged.endswith(extension)
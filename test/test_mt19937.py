@@ -0,0 +1,151 @@
+"""test_mt19937.py
+
+Test the MT19937 Mersenne Twister implementation.
+"""
+
+import os.path
+import pytest
+import random
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.mt19937 import MT19937, MT19937Cipher, recover_seed, temper, untemper
+
+
+def reference(seed: int, count: int) -> list[int]:
+    """Straightforward MT19937 implementation, one output at a time."""
+    mt = [seed]
+    for i in range(1, 624):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xFFFFFFFF)
+
+    index = 624
+    outputs = []
+    for _ in range(count):
+        if index >= 624:
+            for i in range(624):
+                y = (mt[i] & 0x80000000) | (mt[(i+1) % 624] & 0x7FFFFFFF)
+                mt[i] = mt[(i+397) % 624] ^ (y >> 1) ^ (0x9908B0DF if y & 1 else 0)
+            index = 0
+
+        y = mt[index]
+        y ^= y >> 11
+        y ^= (y << 7) & 0x9D2C5680
+        y ^= (y << 15) & 0xEFC60000
+        y ^= y >> 18
+        outputs.append(y)
+        index += 1
+
+    return outputs
+
+
+class TestMT19937(object):
+    @pytest.mark.parametrize("seed, expected", [
+        (5489, [3499211612, 581869302, 3890346734, 3586334585, 545404204]),
+        (1, [1791095845, 4282876139, 3093770124, 4005303368, 491263]),
+    ])
+    def test_known_outputs(self, seed: int, expected: list[int]) -> None:
+        assert MT19937(seed).generate(5) == expected
+
+    @pytest.mark.parametrize("seed", [0, 1, 5489, 0xDEADBEEF, 0xFFFFFFFF])
+    def test_reference(self, seed: int) -> None:
+        assert MT19937(seed).generate(2000) == reference(seed, 2000)
+
+    def test_extract_number(self) -> None:
+        generator = MT19937(1234)
+        outputs = [generator.extract_number() for _ in range(1000)]
+
+        assert outputs == reference(1234, 1000)
+
+    def test_generate_mixed(self) -> None:
+        generator = MT19937(1234)
+        outputs = generator.generate(100) + [generator.extract_number()] + generator.generate(1000)
+
+        assert outputs == reference(1234, 1101)
+
+    @pytest.mark.parametrize("length", [0, 1, 3, 4, 5, 2500])
+    def test_keystream(self, length: int) -> None:
+        keystream = MT19937(42).keystream(length)
+        outputs = reference(42, (length + 3) // 4)
+
+        assert len(keystream) == length
+        assert keystream == b"".join(y.to_bytes(4, "little") for y in outputs)[:length]
+
+
+class TestClone(object):
+    def test_untemper(self) -> None:
+        rng = random.Random(0)
+        for y in [0, 0xFFFFFFFF, *[rng.getrandbits(32) for _ in range(1000)]]:
+            assert untemper(temper(y)) == y
+
+    @pytest.mark.parametrize("skip", [0, 1, 100, 624, 1000])
+    def test_clone(self, skip: int) -> None:
+        generator = MT19937(random.getrandbits(32))
+        generator.generate(skip)
+
+        clone = MT19937.clone(generator.generate(624))
+
+        assert clone.generate(2000) == generator.generate(2000)
+
+    def test_clone_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            _ = MT19937.clone([0] * 623)
+
+
+class TestCipher(object):
+    def test_roundtrip(self) -> None:
+        plaintext = b"A" * 14 + b"attack at dawn"
+        cipher = MT19937Cipher(0xBEEF)
+        ciphertext = cipher.encrypt(plaintext)
+
+        assert ciphertext != plaintext
+        assert MT19937Cipher(0xBEEF).decrypt(ciphertext) == plaintext
+
+    def test_recover_key(self) -> None:
+        """Challenge 24: recover a 16-bit key from known plaintext."""
+        known = b"A" * 14
+        ciphertext = MT19937Cipher(0x1234).encrypt(b"prefix!" + known)
+
+        # XOR the known plaintext back out to get part of the keystream,
+        # starting on an output boundary.
+        start = (len(ciphertext) - len(known) + 3) // 4 * 4
+        keystream = bytes(c ^ p for c, p in zip(ciphertext[start:], known[start-len(ciphertext):]))
+        outputs = [int.from_bytes(keystream[i:i+4], "little") for i in range(0, len(keystream) - 3, 4)]
+
+        seed, _ = recover_seed(outputs, range(1 << 16), offset=start // 4)
+        assert seed == 0x1234
+
+
+class TestRecoverSeed(object):
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_recover(self, jobs: int) -> None:
+        seed = 1_700_000_000 + 1234
+        outputs = MT19937(seed).generate(2)
+
+        found, rate = recover_seed(outputs, range(1_700_000_000, 1_700_000_000 + 3000), jobs=jobs, chunksize=256)
+
+        assert found == seed
+        assert rate > 0
+
+    def test_recover_offset(self) -> None:
+        outputs = MT19937(777).generate(1000)[700:702]
+
+        found, _ = recover_seed(outputs, range(700, 800), offset=700)
+        assert found == 777
+
+    def test_recover_step(self) -> None:
+        outputs = MT19937(300).generate(1)
+
+        assert recover_seed(outputs, range(0, 1000, 3))[0] == 300
+        assert recover_seed(outputs, range(1, 1000, 3))[0] is None
+
+    def test_recover_missing(self) -> None:
+        outputs = MT19937(5000).generate(1)
+
+        assert recover_seed(outputs, range(1000))[0] is None
+
+    def test_recover_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            _ = recover_seed([], range(10))
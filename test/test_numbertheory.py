@@ -0,0 +1,151 @@
+"""test_numbertheory.py
+
+Test the number theory helpers, RSA and Diffie-Hellman.
+"""
+
+import math
+import os.path
+import pytest
+import random
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from algorithms.dh import DiffieHellman, NIST_GENERATOR, NIST_PRIME
+from algorithms.numbertheory import (
+    FixedBaseExp, batch_gcd, crt, egcd, fast_mod, invmod, iroot, is_probable_prime, random_prime
+)
+from algorithms.rsa import (
+    RsaKey, broadcast_decrypt, pkcs1_conforming, pkcs1_pad, pkcs1_unpad
+)
+
+
+class TestArithmetic(object):
+    def test_egcd_invmod(self) -> None:
+        g, x, y = egcd(240, 46)
+        assert g == 2 and 240 * x + 46 * y == 2
+
+        assert invmod(17, 3120) == 2753
+        assert invmod(3, 7) * 3 % 7 == 1
+        with pytest.raises(ValueError):
+            invmod(6, 9)
+
+    @pytest.mark.parametrize("k", [1, 2, 3, 5, 17])
+    def test_iroot(self, k: int) -> None:
+        rng = random.Random(k)
+        for _ in range(50):
+            x = rng.getrandbits(rng.randint(1, 3000))
+            root, exact = iroot(x, k)
+            assert root ** k <= x < (root + 1) ** k
+            assert exact == (root ** k == x)
+
+            assert iroot(root ** k, k) == (root, True)
+
+        assert iroot(-27, 3) == (-3, True)
+        with pytest.raises(ValueError):
+            iroot(-4, 2)
+
+    def test_crt(self) -> None:
+        assert crt([2, 3, 2], [3, 5, 7]) == (23, 105)
+        with pytest.raises(ValueError):
+            crt([1, 2], [4, 6])
+
+    def test_fast_mod(self) -> None:
+        rng = random.Random(1)
+        for _ in range(100):
+            a = rng.getrandbits(rng.randint(1, 60000))
+            b = rng.getrandbits(rng.randint(1, 20000)) | 1
+            assert fast_mod(a, b) == a % b
+
+    def test_batch_gcd(self) -> None:
+        p, q, r, s, t = [random_prime(64) for _ in range(5)]
+        moduli = [p * q, q * r, s * t, 101 * 103]
+        assert batch_gcd(moduli) == [q, q, 1, 1]
+        assert batch_gcd([]) == []
+
+
+class TestPrimes(object):
+    def test_primes(self) -> None:
+        primes = [n for n in range(2000) if is_probable_prime(n)]
+        assert primes == [n for n in range(2, 2000) if all(n % d for d in range(2, math.isqrt(n) + 1))]
+
+        # Carmichael numbers and a strong pseudoprime to several small bases.
+        assert not any(is_probable_prime(n) for n in [561, 41041, 3215031751, 3825123056546413051])
+        assert is_probable_prime(2 ** 127 - 1)
+        assert not is_probable_prime(2 ** 128 + 1)
+
+        p = random_prime(128)
+        assert p.bit_length() == 128 and is_probable_prime(p)
+
+
+class TestFixedBaseExp(object):
+    def test_fixed_base_exp(self) -> None:
+        rng = random.Random(0)
+        p = NIST_PRIME
+        fixed = FixedBaseExp(NIST_GENERATOR, p, window=4)
+
+        for exponent in [0, 1, 2, 15, 16, p - 1] + [rng.randrange(p) for _ in range(20)]:
+            assert fixed(exponent) == pow(NIST_GENERATOR, exponent, p)
+
+        # Exponents the table doesn't cover fall back to pow.
+        assert fixed(p ** 2) == pow(NIST_GENERATOR, p ** 2, p)
+        assert FixedBaseExp(5, 7)(-1) == pow(5, -1, 7)
+
+
+class TestRsa(object):
+    def test_rsa(self) -> None:
+        key = RsaKey.generate(512, e=3)
+        assert key.n.bit_length() == 512
+
+        for m in [0, 1, 42, key.n - 1]:
+            c = key.encrypt(m)
+            assert key.decrypt(c) == m
+            assert RsaKey(key.n, key.e, d=key.d).decrypt(c) == m
+
+        public = key.public_key()
+        assert public.d is None
+        with pytest.raises(ValueError):
+            public.decrypt(1)
+
+        assert key.decrypt_bytes(key.encrypt_bytes(b"hi mom")).lstrip(b"\x00") == b"hi mom"
+
+        with pytest.raises(ValueError):
+            RsaKey(key.n + 2, key.e, p=key.p, q=key.q)
+
+    def test_pkcs1(self) -> None:
+        padded = pkcs1_pad(b"kick it, CC", 64)
+        assert len(padded) == 64
+        assert pkcs1_conforming(padded)
+        assert b"\x00" not in padded[2:-12]
+        assert pkcs1_unpad(padded) == b"kick it, CC"
+
+        with pytest.raises(ValueError):
+            pkcs1_pad(b"A" * 54, 64)
+        with pytest.raises(ValueError):
+            pkcs1_unpad(b"\x00\x02" + b"\x01" * 5 + b"\x00" + b"A" * 56)
+        with pytest.raises(ValueError):
+            pkcs1_unpad(b"\x00\x01" + b"\xff" * 10 + b"\x00" + b"A" * 52)
+
+    def test_broadcast(self) -> None:
+        message = int.from_bytes(b"attack at dawn", "big")
+        keys = [RsaKey.generate(256, e=3) for _ in range(3)]
+        ciphertexts = [key.encrypt(message) for key in keys]
+
+        assert broadcast_decrypt(ciphertexts, [key.n for key in keys]) == message
+
+
+class TestDiffieHellman(object):
+    def test_diffie_hellman(self) -> None:
+        alice = DiffieHellman()
+        bob = DiffieHellman()
+
+        assert alice.public == pow(NIST_GENERATOR, alice.private, NIST_PRIME)
+        assert alice.shared_secret(bob.public) == bob.shared_secret(alice.public)
+        assert len(alice.session_key(bob.public)) == 16
+        assert alice.session_key(bob.public) == bob.session_key(alice.public)
+
+        small = DiffieHellman(p=37, g=5, private=4)
+        assert small.public == pow(5, 4, 37)
+        assert small.shared_secret(37) == 0
@@ -0,0 +1,44 @@
+"""test_parallel.py
+
+Test the process pool helpers.
+"""
+
+import itertools
+import os.path
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from parallel import bounded_map
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+class TestBoundedMap(object):
+    def test_all_tasks(self) -> None:
+        with ProcessPoolExecutor(2) as executor:
+            results = dict(bounded_map(executor, square, range(20), 2))
+
+        assert results == {x: x * x for x in range(20)}
+
+    def test_no_tasks(self) -> None:
+        with ProcessPoolExecutor(2) as executor:
+            assert list(bounded_map(executor, square, [], 2)) == []
+
+    def test_stop_early(self) -> None:
+        tasks = itertools.count()
+
+        with ProcessPoolExecutor(2) as executor:
+            for task, result in bounded_map(executor, square, tasks, 2):
+                assert result == task * task
+                if task >= 10:
+                    break
+
+        # Tasks are only read from the iterable as workers free up.
+        assert next(tasks) <= 10 + 2 * 2 + 1
@@ -0,0 +1,56 @@
+"""test_timing.py
+
+Test the HMAC timing leak attack harness.
+"""
+
+import asyncio
+import os.path
+import pytest
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from attacks.timing import TimingClient, TimingLeakServer, recover_signature, trimmed_median
+
+
+class TestStatistics(object):
+    def test_trimmed_median(self) -> None:
+        assert trimmed_median([1.0, 2.0, 3.0]) == 2.0
+        assert trimmed_median([1.0, 2.0, 3.0, 4.0, 100.0], trim=0.2) == 2.5
+        assert trimmed_median([5.0]) == 5.0
+
+        with pytest.raises(ValueError):
+            trimmed_median([])
+
+
+class TestTimingLeak(object):
+    def test_server_responses(self) -> None:
+        async def run() -> tuple[list[int], int]:
+            async with TimingLeakServer(b"YELLOW SUBMARINE", delay=0.0) as server:
+                signature = server.sign(b"foo")
+                async with TimingClient("127.0.0.1", server.port, connections=2) as client:
+                    results = await client.measure([
+                        f"/test?file=foo&signature={signature.hex()}",
+                        f"/test?file=foo&signature={bytes(20).hex()}",
+                        "/test?file=foo&signature=zz",
+                        "/test?file=foo",
+                    ] * 2)
+                    return [status for status, _ in results], client.requests
+
+        statuses, requests = asyncio.run(run())
+        assert statuses == [200, 500, 500, 500] * 2
+        assert requests == 8
+
+    @pytest.mark.parametrize("delay", [0.002, 0.02])
+    def test_recover_signature(self, delay: float) -> None:
+        async def run() -> tuple[bytes|None, int, bytes]:
+            async with TimingLeakServer(b"YELLOW SUBMARINE", delay=delay, signature_length=3) as server:
+                async with TimingClient("127.0.0.1", server.port) as client:
+                    signature, requests = await recover_signature(client, "foo", length=3)
+                    return signature, requests, server.sign(b"foo")
+
+        signature, requests, expected = asyncio.run(run())
+        assert signature == expected
+        assert requests > 0
@@ -0,0 +1,159 @@
+"""test_utils.py
+
+Test the cryptanalysis utilities.
+"""
+
+import os
+import os.path
+import pytest
+import random
+import sys
+
+# Prepare for relative imports.
+ROOTDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOTDIR)
+
+from bindata import BinData, String
+from evaluators import evaluate_english_bytes
+from utils import (
+    break_repeating_key_xor,
+    normalized_hamming_distances,
+    read_wordlist,
+    xor_key_search
+)
+
+
+PLAINTEXT = String(
+    "It was the best of times, it was the worst of times, it was the age of "
+    "wisdom, it was the age of foolishness, it was the epoch of belief, it "
+    "was the epoch of incredulity, it was the season of light, it was the "
+    "season of darkness, it was the spring of hope, it was the winter of "
+    "despair, we had everything before us, we had nothing before us, we were "
+    "all going direct to heaven, we were all going direct the other way - in "
+    "short, the period was so far like the present period, that some of its "
+    "noisiest authorities insisted on its being received, for good or for "
+    "evil, in the superlative degree of comparison only. There were a king "
+    "with a large jaw and a queen with a plain face, on the throne of "
+    "England; there were a king with a large jaw and a queen with a fair "
+    "face, on the throne of France. In both countries it was clearer than "
+    "crystal to the lords of the State preserves of loaves and fishes, that "
+    "things in general were settled for ever."
+)
+
+
+class TestNormalizedHammingDistances(object):
+    def test_blocksize_too_large(self) -> None:
+        with pytest.raises(ValueError):
+            _ = normalized_hamming_distances(BinData(b"0123"), 3)
+
+
+class TestBreakRepeatingKeyXor(object):
+    @pytest.mark.parametrize("key", [
+        "ICE", "YELLOW SUBMARINE", "Terminator X: Bring the noise",
+    ])
+    def test_break(self, key: str) -> None:
+        ciphertext = PLAINTEXT ^ String(key)
+        results = break_repeating_key_xor(ciphertext)
+
+        assert 1 <= len(results) <= 3
+        assert len(set(r[0] for r in results)) == len(results)
+        assert results[0][0] == String(key)
+        assert results[0][1] == PLAINTEXT
+        assert [r[2] for r in results] == sorted([r[2] for r in results], reverse=True)
+
+    def test_break_sampled(self) -> None:
+        key = String("YELLOW SUBMARINE")
+        ciphertext = PLAINTEXT ^ key
+        key_guess, plaintext, _ = break_repeating_key_xor(ciphertext, samplesize=512)[0]
+
+        assert key_guess == key
+        assert plaintext == PLAINTEXT
+
+    @pytest.mark.parametrize("samplesize", [0, 1, 5])
+    def test_break_tiny_sample(self, samplesize: int) -> None:
+        ciphertext = PLAINTEXT ^ String("ICE")
+        results = break_repeating_key_xor(ciphertext, samplesize=samplesize)
+
+        assert 1 <= len(results) <= 3
+        assert all(len(key) > 0 for key, _, _ in results)
+
+    def test_break_parallel(self) -> None:
+        ciphertext = PLAINTEXT ^ String("ICE")
+
+        serial = break_repeating_key_xor(ciphertext)
+        parallel = break_repeating_key_xor(ciphertext, jobs=2)
+
+        assert serial == parallel
+
+    def test_break_keysizes(self) -> None:
+        ciphertext = PLAINTEXT ^ String("ICE")
+        results = break_repeating_key_xor(ciphertext, keysizes=[3], top_n=5)
+
+        assert len(results) == 1
+        assert results[0][0] == String("ICE")
+
+    def test_break_score(self) -> None:
+        ciphertext = PLAINTEXT ^ String("ICE")
+        key, plaintext, score = break_repeating_key_xor(ciphertext, keysizes=[3])[0]
+
+        # The score is for the returned key, on the data held out from
+        # cracking it.
+        heldout = len(ciphertext) // 8
+        assert score == evaluate_english_bytes(plaintext[-heldout:])
+
+
+class TestXorKeySearch(object):
+    KEY = String("Marley")
+
+    @pytest.fixture
+    def wordlist(self, tmp_path) -> str:
+        rng = random.Random(1234)
+        words = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10)))
+            for _ in range(20000)
+        ]
+        words.insert(12345, self.KEY.to_string())
+
+        path = tmp_path / "wordlist.txt"
+        path.write_text("\n".join(words) + "\n\n")
+        return str(path)
+
+    def test_read_wordlist(self, wordlist: str) -> None:
+        words = list(read_wordlist(wordlist))
+
+        assert len(words) == 20001
+        assert words[12345] == self.KEY
+        assert all(len(word) > 0 for word in words)
+
+    def test_search(self, wordlist: str) -> None:
+        ciphertext = PLAINTEXT ^ self.KEY
+        results = xor_key_search(ciphertext, read_wordlist(wordlist), top_k=5, batchsize=1000)
+
+        assert 1 <= len(results) <= 5
+        assert results[0][0] == self.KEY
+        assert results[0][1] == PLAINTEXT
+        assert [r[2] for r in results] == sorted([r[2] for r in results], reverse=True)
+
+    def test_search_parallel(self, wordlist: str) -> None:
+        ciphertext = PLAINTEXT ^ self.KEY
+
+        serial = xor_key_search(ciphertext, read_wordlist(wordlist), batchsize=1000)
+        parallel = xor_key_search(ciphertext, read_wordlist(wordlist), batchsize=1000, jobs=2)
+
+        assert serial == parallel
+
+    def test_search_no_valid_keys(self) -> None:
+        ciphertext = BinData(os.urandom(64))
+        keys = [BinData(b"\x00"), BinData(b"")]
+
+        assert xor_key_search(ciphertext, keys) == []
+
+    def test_search_empty_key_first(self) -> None:
+        ciphertext = PLAINTEXT ^ self.KEY
+        results = xor_key_search(ciphertext, [BinData(b""), BinData(b""), self.KEY], batchsize=1)
+
+        assert results[0][0] == self.KEY
+
+    def test_search_invalid_method(self) -> None:
+        with pytest.raises(ValueError):
+            _ = xor_key_search(PLAINTEXT, [self.KEY], method="klingon")
@@ -3,12 +3,36 @@
 Handy functions :)
 """
 
-import requests
+import contextlib
+import functools
+import heapq
+import itertools
+import string
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 
 from bindata import BinData
-from evaluators import evaluate_english
+from bindataarray import BinDataArray
+from evaluators import evaluate_english, evaluate_english_bytes
+from parallel import bounded_map
+
+
+def _shortest_repetition(data: BinData) -> BinData:
+    """Find the shortest piece of data which can be repeated to create
+    the given data.
+
+    Parameters:
+        data        Data to shorten
+
+    Returns:
+        Returns the shortest repeating piece of the data.
+    """
+    raw = data.to_bytes()
+    for size in range(1, len(raw)):
+        if len(raw) % size == 0 and raw[:size] * (len(raw) // size) == raw:
+            return data[:size]
+    return data
 
 
 def read_challenge_data(challenge: int) -> str:
@@ -20,6 +44,9 @@ def read_challenge_data(challenge: int) -> str:
     Returns:
         Returns the downloaded data as a string.
     """
+    # Only needed here, and slow to import.
+    import requests
+
     url = f"https://cryptopals.com/static/challenge-data/{challenge}.txt"
     res = requests.get(url)
 
@@ -63,6 +90,228 @@ def normalized_hamming_distances(ciphertext: BinData, blocksize: int) -> float:
     return score / blocksize / blockcount
 
 
+def break_repeating_key_xor(
+        ciphertext: BinData,
+        keysizes: Iterable[int] = range(2, 41),
+        top_n: int = 3,
+        method: str = "english",
+        samplesize: int|None = 1 << 20,
+        jobs: int = 1
+) -> list[tuple[BinData, BinData, float]]:
+    """Break repeating-key XOR encryption. Every key size is ranked by
+    the normalized Hamming distance between blocks of that size, then
+    the columns of each of the top key sizes (and their divisors) are
+    cracked as single-byte XOR. The supported evaluation methods are:
+
+        english     Plaintext looks like English text
+
+    Parameters:
+        ciphertext  Ciphertext to decrypt
+        keysizes    All possible key sizes
+        top_n       Number of key sizes to crack
+        method      Evaluation method for the best guess
+        samplesize  Number of ciphertext bytes used to crack and score
+                    each key (None to use the whole ciphertext)
+        jobs        Number of processes used to crack the columns
+
+    Returns:
+        Returns a list of at most top_n (key, plaintext, score) tuples,
+        ordered from best to worst score.
+    """
+    # Ranking a key size only needs a few hundred blocks, no matter how
+    # long the ciphertext is.
+    ranked = []
+    for keysize in keysizes:
+        sample = ciphertext[:256*keysize]
+        if 2*keysize > len(sample):
+            continue
+
+        ranked.append((normalized_hamming_distances(sample, keysize), keysize))
+
+    ranked.sort()
+
+    # Multiples of the real key size look just as good as the real one, but
+    # they have less data per column and are more likely to get a few key
+    # bytes wrong. Crack the divisors of the top key sizes too, and score
+    # each key on data it wasn't cracked from so mistakes aren't rewarded.
+    valid = {keysize for _, keysize in ranked}
+    candidates = set()
+    for _, keysize in ranked[:top_n]:
+        candidates.update(d for d in valid if keysize % d == 0)
+
+    scored = []
+
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if jobs > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+
+        for keysize in sorted(candidates):
+            # Crack the key from most of the sample and score it on the
+            # rest, so the key returned is the one that was scored. Both
+            # parts need at least a whole key's worth of data; ranking made
+            # sure the ciphertext is long enough.
+            sample = ciphertext
+            if samplesize is not None:
+                sample = ciphertext[:max(samplesize, 2*keysize)]
+            split = len(sample) - max(len(sample) // 8, keysize)
+
+            blocks = BinDataArray.from_blocks(sample[:split], keysize)
+            key, _ = blocks.recover_key(method, executor=executor)
+            offset = split % len(key)
+            score = evaluate_english_bytes(sample[split:] ^ (key[offset:] + key[:offset]))
+            scored.append((score, keysize, _shortest_repetition(key)))
+
+    # Prefer shorter keys when scores are tied, and drop keys which are just
+    # a better key repeated.
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    results = []
+    for score, _, key in scored:
+        if len(results) < top_n and all(key != k for k, _, _ in results):
+            results.append((key, ciphertext ^ key, score))
+
+    return results
+
+
+# Ciphertext being searched by the current process. Worker processes get their
+# own copy once when they start instead of with every batch of keys.
+_KEY_SEARCH_CIPHERTEXT = (b"", b"")
+
+
+def _key_search_init(sample: bytes, ciphertext: bytes) -> None:
+    """Set the ciphertext searched by _key_search_batch.
+
+    Parameters:
+        sample      Prefix of the ciphertext used to filter keys
+        ciphertext  Full ciphertext
+    """
+    global _KEY_SEARCH_CIPHERTEXT
+    _KEY_SEARCH_CIPHERTEXT = (sample, ciphertext)
+
+
+def _key_search_batch(keys: list[bytes], keep: int) -> list[tuple[float, bytes]]:
+    """Score a batch of XOR keys. Every key is first scored against a
+    short prefix of the ciphertext, then only the best few keys are
+    scored against the whole ciphertext. Keys which decrypt the prefix
+    to anything non-printable are skipped.
+
+    Parameters:
+        keys        Keys to score
+        keep        Number of keys to score against the whole ciphertext
+
+    Returns:
+        Returns (score, key) tuples for the keys scored against the
+        whole ciphertext.
+    """
+    sample, ciphertext = _KEY_SEARCH_CIPHERTEXT
+    sample = BinData(sample)
+    printable = string.printable.encode("ascii")
+
+    prefiltered = []
+    for key in keys:
+        plaintext = sample ^ BinData(key)
+
+        # Most wrong keys produce some non-printable bytes. Checking for them
+        # is much cheaper than scoring the plaintext.
+        if plaintext.to_bytes().translate(None, printable):
+            continue
+
+        prefiltered.append((evaluate_english_bytes(plaintext), key))
+
+    survivors = heapq.nlargest(keep, prefiltered)
+    ciphertext = BinData(ciphertext)
+    return [(evaluate_english_bytes(ciphertext ^ BinData(key)), key) for _, key in survivors]
+
+
+def read_wordlist(path: str) -> Iterator[BinData]:
+    """Read candidate keys from a wordlist file, one key per line. The
+    file is read lazily, so it can be much larger than memory.
+
+    Parameters:
+        path        Path to the wordlist
+
+    Returns:
+        Yields every non-empty line of the wordlist as BinData.
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            word = line.rstrip(b"\r\n")
+            if word:
+                yield BinData(word)
+
+
+def xor_key_search(
+        ciphertext: BinData,
+        keys: Iterable[BinData],
+        top_k: int = 10,
+        method: str = "english",
+        samplesize: int = 256,
+        batchsize: int = 8192,
+        jobs: int = 1
+) -> list[tuple[BinData, BinData, float]]:
+    """Search a (possibly huge) stream of candidate keys for the ones
+    which best decrypt a repeating-key XOR ciphertext. Keys are scored
+    in batches. Each key is checked against a short prefix of the
+    ciphertext first, and only the best keys of every batch are checked
+    against the whole ciphertext. Memory use does not depend on the
+    number of keys. The supported evaluation methods are:
+
+        english     Plaintext looks like English text
+
+    Parameters:
+        ciphertext  Ciphertext to decrypt
+        keys        Candidate keys, e.g. from read_wordlist
+        top_k       Number of keys to return
+        method      Evaluation method for the best guess
+        samplesize  Number of ciphertext bytes used to filter keys
+        batchsize   Number of keys scored at once
+        jobs        Number of processes used to score keys
+
+    Returns:
+        Returns a list of at most top_k (key, plaintext, score) tuples,
+        ordered from best to worst score. Keys which produce invalid
+        plaintext are never returned.
+    """
+    if method != "english":
+        raise ValueError(f"Unrecognized evaluation method '{method}'")
+
+    state = (ciphertext[:samplesize].to_bytes(), ciphertext.to_bytes())
+    keys = iter(keys)
+    best = []
+
+    def batches() -> Iterator[list[bytes]]:
+        # Stop when the keys run out, not when a batch is all empty keys.
+        while chunk := list(itertools.islice(keys, batchsize)):
+            batch = [k.to_bytes() for k in chunk if len(k) > 0]
+            if batch:
+                yield batch
+
+    def merge(scored: list[tuple[float, bytes]]) -> None:
+        for score, key in scored:
+            if score < 0 or any(key == k for _, k in best):
+                continue
+
+            heapq.heappush(best, (score, key))
+            if len(best) > top_k:
+                heapq.heappop(best)
+
+    if jobs > 1:
+        search = functools.partial(_key_search_batch, keep=top_k)
+        with ProcessPoolExecutor(jobs, initializer=_key_search_init, initargs=state) as executor:
+            for _, scored in bounded_map(executor, search, batches(), jobs):
+                merge(scored)
+    else:
+        _key_search_init(*state)
+        try:
+            for batch in batches():
+                merge(_key_search_batch(batch, top_k))
+        finally:
+            _key_search_init(b"", b"")
+
+    best.sort(reverse=True)
+    return [(BinData(key), ciphertext ^ BinData(key), score) for score, key in best]
+
+
 def xor_otp_best_guess(
         ciphertext: BinData,
         keys: Sequence[BinData],